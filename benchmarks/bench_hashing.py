@@ -0,0 +1,153 @@
+"""
+Benchmark of the scaling of the hashing of large numpy array arguments with the number of threads:
+    - joblib: joblib's hasher (single-threaded), as used by cachecache by default,
+    - tree[threads=n]: tree_digest of cachecache.hash_memo (Cacher(digest_keys=True, hash_threads=n)),
+      hashing chunks of the array across n threads, for n from 1 to the number of CPU cores,
+    - hit[hash_threads=n]: cache hit of a function of the array, with Cacher(digest_keys=True, hash_threads=n).
+
+Results (median, min, mean and number of runs of each benchmark in seconds, and hashing throughput
+and speedup over a single thread) are written to a JSON file. Digests are checked to be identical
+whatever the number of threads.
+
+Runs offline, in a temporary cache directory (on a tmpfs, /dev/shm, unless --cache-dir is given).
+Arrays of 1GB require about 2GB of free memory: use --size to hash smaller arrays.
+
+Usage:
+    python benchmarks/bench_hashing.py [--output results.json] [--size 1e9] [--max-threads 8]
+                                       [--cache-dir /path] [--quick]
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import joblib
+import numpy as np
+
+from cachecache import Cacher
+from cachecache.hash_memo import CHUNK_BYTES, array_digest
+
+from bench_suite import measure, package_version
+
+
+def identity(x, i=0):
+    "Benchmarked function of a single argument."
+    return i
+
+
+def thread_counts(max_threads):
+    "Powers of two up to max_threads, and max_threads."
+    counts = []
+    n = 1
+    while n < max_threads:
+        counts.append(n)
+        n *= 2
+
+    return counts + [max_threads]
+
+
+def run(cache_dir, nbytes=10**9, max_threads=None, quick=False):
+    "Run all benchmarks, caching in 'cache_dir', and return their results {name: timings}."
+    results = {}
+    timing = dict(min_time=0.05, min_runs=1) if quick else dict(min_time=1, min_runs=3)
+    max_threads = max_threads or os.cpu_count() or 1
+
+    def record(name, timings):
+        timings["throughput"] = nbytes / timings["median"]  # bytes per second
+        results[name] = timings
+        print(f"{name:<30} median {timings['median'] * 1e3:>10.1f}ms "
+              f"({timings['throughput'] / 1e9:.2f}GB/s, min {timings['min'] * 1e3:.1f}ms, "
+              f"{timings['n']} runs)")
+
+    array = np.random.default_rng(0).integers(0, 255, nbytes, dtype=np.uint8)
+
+    if not quick:
+        record("joblib", measure(lambda i: joblib.hash(array), **timing))
+
+    digests = set()
+    for n_threads in thread_counts(max_threads):
+        with ThreadPoolExecutor(n_threads) as executor:
+            executor = executor if n_threads > 1 else None
+            digests.add(array_digest(array, executor))
+            record(f"tree[threads={n_threads}]", measure(
+                lambda i: array_digest(array, executor), **timing
+            ))
+    assert len(digests) == 1, "digests differ across thread counts"
+
+    for n_threads in thread_counts(max_threads):
+        cacher = Cacher(
+            os.path.join(cache_dir, f"threads_{n_threads}"), digest_keys=True, hash_threads=n_threads
+        )
+        cached_identity = cacher(identity)
+        cached_identity(array)
+        record(f"hit[hash_threads={n_threads}]", measure(lambda i: cached_identity(array), **timing))
+
+    # speedup of each thread count over a single thread
+    for prefix in ("tree[threads=", "hit[hash_threads="):
+        single_thread_median = results[f"{prefix}1]"]["median"]
+        for name, timings in results.items():
+            if name.startswith(prefix):
+                timings["speedup"] = single_thread_median / timings["median"]
+
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--output", default="bench_hashing_results.json",
+                        help="JSON file to write the results to")
+    parser.add_argument("--size", type=float, default=1e9,
+                        help="size of the hashed array, in bytes")
+    parser.add_argument("--max-threads", type=int, default=None,
+                        help="largest number of threads benchmarked (default: number of CPU cores)")
+    parser.add_argument("--cache-dir", default=None,
+                        help="directory to create the temporary cache directory in "
+                             "(default: /dev/shm if it exists, else the system temporary directory)")
+    parser.add_argument("--quick", action="store_true",
+                        help="fewer runs of each benchmark, arrays up to 256MB, and no joblib baseline")
+    args = parser.parse_args(argv)
+
+    nbytes = int(min(args.size, 2**28) if args.quick else args.size)
+    cache_dir_parent = args.cache_dir
+    if cache_dir_parent is None and os.path.isdir("/dev/shm"):
+        cache_dir_parent = "/dev/shm"
+    cache_dir = tempfile.mkdtemp(prefix="cachecache_bench_", dir=cache_dir_parent)
+    try:
+        results = run(cache_dir, nbytes, args.max_threads, args.quick)
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    print(f"\n{'benchmark':<30} {'speedup':>8}")
+    for name, timings in results.items():
+        if "speedup" in timings:
+            print(f"{name:<30} {timings['speedup']:>7.2f}x")
+
+    report = {
+        "metadata": {
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "cachecache": package_version("cachecache"),
+            "joblib": joblib.__version__,
+            "numpy": np.__version__,
+            "nbytes": nbytes,
+            "chunk_bytes": CHUNK_BYTES,
+            "quick": args.quick,
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,39 @@
+"""
+Benchmark of the time taken by 'import cachecache' in a fresh interpreter,
+and check that the default cache, joblib and psutil are not loaded at import time.
+
+Usage:
+    python benchmarks/bench_import.py [n_runs]
+"""
+import statistics
+import subprocess
+import sys
+
+SNIPPET = """
+import sys, time
+t = time.perf_counter()
+import cachecache
+t = time.perf_counter() - t
+opened = cachecache.cache._global_cache_memory is not cachecache.cachecache._MISSING
+print(t, 'joblib' in sys.modules, 'psutil' in sys.modules, opened)
+"""
+
+
+def main(n_runs=10):
+    durations = []
+    for _ in range(n_runs):
+        output = subprocess.run(
+            [sys.executable, "-c", SNIPPET], capture_output=True, text=True, check=True
+        ).stdout.split()
+        durations.append(float(output[0]))
+        joblib_imported, psutil_imported, cache_opened = output[1:]
+
+    print(f"'import cachecache' over {n_runs} runs: "
+          f"median {statistics.median(durations) * 1e3:.1f}ms, "
+          f"min {min(durations) * 1e3:.1f}ms, max {max(durations) * 1e3:.1f}ms")
+    print(f"joblib imported: {joblib_imported}, psutil imported: {psutil_imported}, "
+          f"default cache opened: {cache_opened}")
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
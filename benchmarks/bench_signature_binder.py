@@ -0,0 +1,64 @@
+"""
+Microbenchmark of the per-call overhead of binding arguments to their names,
+comparing a per-call inspect.signature (former make_arg_kwargs_dic)
+to the precompiled SignatureBinder, for functions with 1, 10 and 50 parameters.
+
+Usage:
+    python benchmarks/bench_signature_binder.py
+"""
+import inspect
+import timeit
+
+from cachecache.cachecache import SignatureBinder
+
+
+def make_function(n_params):
+    "Build a function with n_params parameters, half of them with default values."
+    n_args = n_params // 2
+    params = [f"a{i}" for i in range(n_args)] + [f"k{i}=None" for i in range(n_params - n_args)]
+    namespace = {}
+    exec(f"def func({', '.join(params)}):\n    return None", namespace)
+    return namespace["func"]
+
+
+def bind_with_inspect(func, args, kwargs):
+    "Former implementation of make_arg_kwargs_dic, inspecting the signature at every call."
+    sig = inspect.signature(func)
+    arg_kwarg_names = [param.name for param in sig.parameters.values()]
+    wrong_kwargs = [name for name in kwargs.keys() if name not in arg_kwarg_names]
+    assert len(wrong_kwargs) == 0
+    args_kwargs = {}
+    for i, value in enumerate(args):
+        name = arg_kwarg_names[i]
+        args_kwargs[name] = value
+        args_kwargs[name + "_arg_index"] = i
+    args_kwargs = {**args_kwargs, **kwargs}
+    for name, param in sig.parameters.items():
+        if (name not in args_kwargs) and (param.default is not inspect.Parameter.empty):
+            args_kwargs[name] = param.default
+    return args_kwargs
+
+
+def main(number=20000):
+    print(f"{'n params':>8} | {'inspect (us/call)':>17} | {'binder (us/call)':>16} | speedup")
+    for n_params in (1, 10, 50):
+        func = make_function(n_params)
+        names = list(inspect.signature(func).parameters)
+        n_args = max(1, n_params // 2)
+        args = tuple(range(n_args))
+        kwargs = {names[-1]: 0} if n_params > 1 else {}
+
+        binder = SignatureBinder(func)
+        assert binder.bind(args, kwargs) == bind_with_inspect(func, args, kwargs)
+
+        t_inspect = min(timeit.repeat(
+            lambda: bind_with_inspect(func, args, kwargs), number=number, repeat=5
+        )) / number * 1e6
+        t_binder = min(timeit.repeat(
+            lambda: binder.bind(args, kwargs), number=number, repeat=5
+        )) / number * 1e6
+        print(f"{n_params:>8} | {t_inspect:>17.2f} | {t_binder:>16.2f} | {t_inspect / t_binder:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""
+Benchmark suite of the overhead of cached functions, on their hit, miss and override paths:
+    - hit: latency of reloading cached results (from the disk cache),
+      for payloads from bytes to gigabytes, and for arguments from ints to large numpy arrays,
+    - miss: overhead of computing and caching results, compared to the bare function,
+    - again: cost of recomputing results with again=True, compared to the bare function,
+    - cache_path: cost of a hit in a cache opened at run time with cache_path,
+      compared to a hit in the global cache of the cacher,
+    - distributed_cacher: cost of a hit through distributed_cacher, compared to a hit through the cacher.
+
+Results (median, min, mean and number of runs of each benchmark, in seconds) are written to a JSON file,
+and can be compared to the results of a previous run: benchmarks slower than 'threshold' times
+their previous median are reported as regressions (and the exit status is 1).
+
+Runs offline, in a temporary cache directory (on a tmpfs, /dev/shm, to time cachecache
+rather than the disk, unless --cache-dir is given). Payloads of 1GB require about 4GB of free memory
+and of free space in the cache directory: use --max-payload to cap payload sizes.
+
+Usage:
+    python benchmarks/bench_suite.py [--output results.json] [--compare previous.json] [--threshold 1.25]
+                                     [--max-payload 1e9] [--cache-dir /path] [--quick]
+"""
+import argparse
+import importlib.metadata
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+import joblib
+import numpy as np
+
+from cachecache import Cacher, distributed_cacher
+
+PAYLOAD_SIZES = (10, 10**3, 10**5, 10**7, 10**8, 10**9)  # bytes
+ARGUMENT_SIZES = (10**3, 10**5, 10**7)  # bytes of numpy array arguments
+
+
+def payload(nbytes, i=0, again=False, cache_path=None):
+    "Benchmarked function, returning an array of 'nbytes' bytes."
+    return np.full(nbytes, i % 256, dtype=np.uint8)
+
+
+def identity(x, i=0):
+    "Benchmarked function of a single argument."
+    return i
+
+
+def payload_from_datapath(datapath, nbytes, i=0, cache_path=None):
+    "Benchmarked function of distributed_cacher."
+    return payload(nbytes, i)
+
+
+def package_version(name):
+    "Installed version of package 'name' (None if not installed)."
+    try:
+        return importlib.metadata.version(name)
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+def measure(func, teardown=None, min_time=0.2, min_runs=5, max_runs=2000):
+    """
+    Time successive calls func(i), i being the index of the call,
+    until min_runs calls were made and min_time seconds elapsed (or max_runs calls were made).
+    - teardown: None|function, called (untimed) with i after each call
+
+    Returns a dictionnary of the median, min and mean durations (seconds) and number of runs.
+    """
+    durations = []
+    start_time = time.perf_counter()
+    for i in range(max_runs):
+        call_start_time = time.perf_counter()
+        func(i)
+        durations.append(time.perf_counter() - call_start_time)
+        if teardown is not None:
+            teardown(i)
+        if len(durations) >= min_runs and time.perf_counter() - start_time > min_time:
+            break
+
+    return {
+        "median": statistics.median(durations),
+        "min": min(durations),
+        "mean": statistics.mean(durations),
+        "n": len(durations),
+    }
+
+
+def run(cache_dir, max_payload=10**9, quick=False):
+    "Run all benchmarks, caching in 'cache_dir', and return their results {name: timings}."
+    results = {}
+    timing = dict(min_time=0.05, min_runs=3) if quick else {}
+
+    def record(name, timings):
+        results[name] = timings
+        print(f"{name:<45} median {timings['median'] * 1e6:>12.1f}us "
+              f"(min {timings['min'] * 1e6:.1f}us, {timings['n']} runs)")
+
+    cacher = Cacher(os.path.join(cache_dir, "global"))
+    cached_payload = cacher(payload)
+    cached_identity = cacher(identity)
+    other_cache_path = os.path.join(cache_dir, "other")
+
+    # Hits, misses and again=True, for payloads from bytes to gigabytes
+    for nbytes in (size for size in PAYLOAD_SIZES if size <= max_payload):
+        # fewer runs for large payloads, which take seconds to write
+        runs = dict(timing, min_runs=1 if quick else 3) if nbytes >= 10**8 else timing
+
+        record(f"bare[payload={nbytes:.0e}B]", measure(lambda i: payload(nbytes, i), **runs))
+
+        cached_payload(nbytes)
+        record(f"hit[payload={nbytes:.0e}B]", measure(lambda i: cached_payload(nbytes), **runs))
+
+        record(f"miss[payload={nbytes:.0e}B]", measure(
+            lambda i: cached_payload(nbytes, i + 1),
+            # keeps the cache from filling the disk with large payloads
+            teardown=(lambda i: cacher.invalidate(cached_payload)) if nbytes >= 10**7 else None,
+            **runs,
+        ))
+        cacher.invalidate(cached_payload)
+
+        cached_payload(nbytes)
+        record(f"again[payload={nbytes:.0e}B]", measure(
+            lambda i: cached_payload(nbytes, again=True), **runs
+        ))
+        cacher.invalidate(cached_payload)
+
+    # Hits, for arguments from ints to large numpy arrays
+    arguments = {
+        "int": 1,
+        "str": "a" * 100,
+        "tuple": tuple(range(100)),
+        "dict": {str(i): i for i in range(100)},
+        **{f"array={nbytes:.0e}B": np.ones(nbytes, dtype=np.uint8) for nbytes in ARGUMENT_SIZES},
+    }
+    for name, argument in arguments.items():
+        cached_identity(argument)
+        record(f"hit[arg={name}]", measure(lambda i: cached_identity(argument), **timing))
+
+    # Hits in a cache opened at run time with cache_path, compared to the global cache
+    cached_payload(10)
+    record("hit[global cache]", measure(lambda i: cached_payload(10), **timing))
+    cached_payload(10, cache_path=other_cache_path)
+    record("hit[cache_path]", measure(
+        lambda i: cached_payload(10, cache_path=other_cache_path), **timing
+    ))
+
+    # Hits through distributed_cacher, compared to the cacher
+    datapath = os.path.join(cache_dir, "datapath")
+    os.makedirs(datapath, exist_ok=True)
+    distributed_payload = distributed_cacher(global_cache=cacher)(payload_from_datapath)
+    cached_payload_from_datapath = cacher(payload_from_datapath)
+    cached_payload_from_datapath(datapath, 10, cache_path=datapath)
+    record("hit[cacher, cache_path=datapath]", measure(
+        lambda i: cached_payload_from_datapath(datapath, 10, cache_path=datapath), **timing
+    ))
+    distributed_payload(datapath, 10)
+    record("hit[distributed_cacher]", measure(
+        lambda i: distributed_payload(datapath, 10), **timing
+    ))
+
+    return results
+
+
+def compare(results, previous_results, threshold=1.25):
+    """
+    Print the ratio of the median of each benchmark to its median in 'previous_results',
+    and return the names of the benchmarks slower than 'threshold' times their previous median.
+    """
+    regressions = []
+    print(f"\n{'benchmark':<45} {'previous (us)':>14} {'current (us)':>14} {'ratio':>7}")
+    for name, timings in results.items():
+        if name not in previous_results:
+            continue
+        previous_median = previous_results[name]["median"]
+        ratio = timings["median"] / previous_median if previous_median else float("inf")
+        flag = ""
+        if ratio > threshold:
+            regressions.append(name)
+            flag = "  <- regression"
+        print(f"{name:<45} {previous_median * 1e6:>14.1f} {timings['median'] * 1e6:>14.1f} "
+              f"{ratio:>6.2f}x{flag}")
+
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--output", default="bench_results.json",
+                        help="JSON file to write the results to")
+    parser.add_argument("--compare", default=None,
+                        help="JSON file of the results of a previous run, to compare to")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="ratio to the previous median above which a benchmark regressed")
+    parser.add_argument("--max-payload", type=float, default=1e9,
+                        help="largest payload size benchmarked, in bytes")
+    parser.add_argument("--cache-dir", default=None,
+                        help="directory to create the temporary cache directory in "
+                             "(default: /dev/shm if it exists, else the system temporary directory)")
+    parser.add_argument("--quick", action="store_true",
+                        help="fewer runs of each benchmark, and payloads up to 1MB")
+    args = parser.parse_args(argv)
+
+    max_payload = min(args.max_payload, 1e6) if args.quick else args.max_payload
+    cache_dir_parent = args.cache_dir
+    if cache_dir_parent is None and os.path.isdir("/dev/shm"):
+        cache_dir_parent = "/dev/shm"
+    cache_dir = tempfile.mkdtemp(prefix="cachecache_bench_", dir=cache_dir_parent)
+    try:
+        results = run(cache_dir, max_payload, args.quick)
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    report = {
+        "metadata": {
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "cachecache": package_version("cachecache"),
+            "joblib": joblib.__version__,
+            "numpy": np.__version__,
+            "max_payload": max_payload,
+            "quick": args.quick,
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.compare is not None:
+        with open(args.compare) as f:
+            previous_results = json.load(f)["results"]
+        regressions = compare(results, previous_results, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) (slower than {args.threshold}x): "
+                  + ", ".join(regressions))
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
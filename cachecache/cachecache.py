@@ -1,13 +1,197 @@
 from pathlib import Path
+import contextlib
+import contextvars
 import functools
+from collections import OrderedDict
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
 from typing import Union, Optional
 
-from joblib import Memory
-import psutil
 import inspect
+import os
+import threading
+import time
+import traceback
+import warnings
+import weakref
 
 from cachecache.CONFIG import default_cache_path
-from cachecache.utils import is_writable
+from cachecache.compression import (
+    AutoCompression, check_compress, compressed_store_backend, register_zstd
+)
+from cachecache.hash_memo import HashMemo
+from cachecache.keys import FastKey
+from cachecache.locks import LeaseLock
+from cachecache.size_tracker import CacheSizeTracker, EVICTION_POLICIES
+from cachecache.stats import CacheStats, CallEvent, current_event, record_stage
+from cachecache.utils import is_writable, estimate_size
+from cachecache.write_behind import WriteBehind
+
+
+# Arguments of decorated functions that alter caching behavior at run time
+CACHING_ARGUMENTS = ["again", "cache_results", "cache_path", "memory_tier", "max_age", "mmap_mode"]
+
+# Memory-mapping modes of numpy arrays reloaded from the cache (None: no memory-mapping)
+MMAP_MODES = (None, "r+", "r", "w+", "c")
+
+# Maximum number of joblib MemorizedFunc objects kept by a Cacher for reuse across calls
+# (the least recently used ones are dropped first)
+MAX_MEMORIZED_FUNCS = 256
+
+# Sentinel for missing results
+_MISSING = object()
+
+
+def _age_limit(ttl=None, max_age=None):
+    "Max age of the cached results to reload, given a time to live and a max_age (None if no limit)."
+    return min([limit for limit in (ttl, max_age) if limit is not None], default=None)
+
+
+def _resolve_mmap_mode(default, mmap_mode=None):
+    "Memory-mapping mode of a call: the 'default' of the cacher if None, no memory-mapping if False."
+    if mmap_mode is None:
+        return default
+    if mmap_mode is False:
+        return None
+    if mmap_mode not in MMAP_MODES:
+        raise ValueError(f"mmap_mode must be one of {MMAP_MODES} or False, not '{mmap_mode}'.")
+
+    return mmap_mode
+
+
+def _check_executor(executor):
+    "Raise a ValueError if 'executor' is neither None nor a thread pool."
+    if executor is not None and not isinstance(executor, ThreadPoolExecutor):
+        raise ValueError(
+            "executor must be a concurrent.futures.ThreadPoolExecutor (calls submitted to it "
+            "share the state of the cacher, which cannot be sent to other processes), "
+            f"not {type(executor).__name__}."
+        )
+
+
+def _as_call(arguments):
+    """
+    Positional and keyword arguments of a call of the map method of cached functions:
+    a tuple (or list) holds positional arguments, a dict keyword arguments,
+    and any other object is the single positional argument.
+    """
+    if isinstance(arguments, dict):
+        return (), arguments
+    if isinstance(arguments, (tuple, list)):
+        return tuple(arguments), {}
+    return (arguments,), {}
+
+
+def _timed_call(func, args, kwargs):
+    "Return func(*args, **kwargs) and the time it took to compute, in seconds."
+    start_time = time.time()
+    results = func(*args, **kwargs)
+
+    return results, time.time() - start_time
+
+
+class SignatureBinder:
+    """
+    Precompiled view of a function signature, used to bind call arguments to their names.
+
+    The signature is inspected once (at decoration time), and the parameter names
+    and default values are stored in lookup tables, so that binding the arguments
+    of each call only costs a couple of dict operations.
+
+    Arguments:
+        - func: function
+    """
+
+    def __init__(self, func):
+        self.func_name = func.__name__
+        self.signature = inspect.signature(func)
+        parameters = self.signature.parameters.values()
+
+        # All parameter names, used to catch unexpected keyword arguments
+        self.names = tuple(param.name for param in parameters)
+        self._names_set = frozenset(self.names)
+
+        # Parameters that can be passed positionally, in order
+        self.positional_names = tuple(
+            param.name
+            for param in parameters
+            if param.kind
+            in (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD)
+        )
+        self._index_names = tuple(name + "_arg_index" for name in self.positional_names)
+        var_positional = [
+            param.name for param in parameters if param.kind == inspect.Parameter.VAR_POSITIONAL
+        ]
+        self.var_positional_name = var_positional[0] if var_positional else None
+
+        # Default values of parameters, for arguments not passed
+        self.defaults = {
+            param.name: param.default
+            for param in parameters
+            if param.default is not inspect.Parameter.empty
+        }
+
+    def bind(self, args, kwargs):
+        """
+        Make a dictionnary storing boths args and kwargs of func
+        (see make_arg_kwargs_dic).
+        """
+        if not self._names_set.issuperset(kwargs):
+            wrong_kwargs = [name for name in kwargs if name not in self._names_set]
+            raise AssertionError(
+                f"{self.func_name}() got >=1 unexpected keyword argument(s): {wrong_kwargs}"
+            )
+
+        n_positional = len(self.positional_names)
+        if len(args) <= n_positional:
+            args_kwargs = dict(zip(self.positional_names, args))
+        elif self.var_positional_name is not None:
+            args_kwargs = dict(zip(self.positional_names, args))
+            args_kwargs[self.var_positional_name] = tuple(args[n_positional:])
+            args_kwargs[self.var_positional_name + "_arg_index"] = n_positional
+        else:
+            raise TypeError(
+                f"{self.func_name}() takes {n_positional} positional argument(s) "
+                f"but {len(args)} were given"
+            )
+
+        # Index of arguments PASSED as positional arguments
+        args_kwargs.update(zip(self._index_names, range(len(args))))
+
+        # Add arguments PASSED as keyword arguments,
+        # then keyword arguments NOT PASSED, with default values
+        args_kwargs.update(kwargs)
+        for name, default in self.defaults.items():
+            if name not in args_kwargs:
+                args_kwargs[name] = default
+
+        return args_kwargs
+
+
+# SignatureBinder objects, built once per function
+_signature_binders = weakref.WeakKeyDictionary()
+
+
+def get_signature_binder(func):
+    """
+    Return the SignatureBinder of func, building it on first use.
+
+    Arguments:
+        - func: function
+
+    Returns:
+        - binder: SignatureBinder instance
+    """
+    try:
+        return _signature_binders[func]
+    except KeyError:
+        binder = SignatureBinder(func)
+    except TypeError:
+        # func cannot be weakly referenced
+        return SignatureBinder(func)
+
+    _signature_binders[func] = binder
+
+    return binder
 
 
 def make_arg_kwargs_dic(func, args, kwargs):
@@ -26,36 +210,240 @@ def make_arg_kwargs_dic(func, args, kwargs):
     Returns:
         - args_kwargs: dictionnary holding boths args and kwargs.
     """
+    return get_signature_binder(func).bind(args, kwargs)
+
+
+class MemoryPool:
+    """
+    Bounded, thread-safe pool of joblib Memory objects, keyed by resolved cache path.
+
+    Used by Cacher for the caches requested at run time with 'cache_path',
+    so that opening a given cache (write permission and disk space checks,
+    directory creation, cache size enforcement) only happens once.
+    The least recently used caches are dropped when the pool is full.
+
+    Arguments:
+        - open_memory: callable, path -> joblib Memory object (or None if path not writable)
+        - maxsize: int, maximum number of Memory objects held by the pool
+        - on_evict: callable, Memory object -> None, called with the Memory objects dropped from the pool
+    """
+
+    def __init__(self, open_memory, maxsize: int = 32, on_evict=None):
+        self.open_memory = open_memory
+        self.maxsize = maxsize
+        self.on_evict = on_evict
+        self._memories = OrderedDict()
+        self._lock = threading.Lock()
+
+        # resolved path of each path as passed at run time,
+        # to skip resolving paths (filesystem calls) on every call
+        self._resolved_paths = {}
+
+    def __len__(self):
+        return len(self._memories)
+
+    def get(self, path: Union[str, Path]):
+        """
+        Return the Memory object caching at 'path', opening it if not in the pool.
+        Returns None if 'path' is not writable (which is not remembered by the pool).
+        """
+        key = self._resolved_paths.get(path)
+        if key is None:
+            key = Path(path).expanduser().resolve()
+        with self._lock:
+            memory = self._memories.get(key)
+            if memory is not None:
+                self._memories.move_to_end(key)
+                self._resolved_paths[path] = key
+                return memory
+
+        # Opening a cache can be slow, so it happens outside of the lock
+        memory = self.open_memory(key)
+        if memory is None:
+            return None
+
+        evicted = []
+        with self._lock:
+            memory = self._memories.setdefault(key, memory)
+            self._memories.move_to_end(key)
+            self._resolved_paths[path] = key
+            while len(self._memories) > self.maxsize:
+                evicted_key, evicted_memory = self._memories.popitem(last=False)
+                evicted.append(evicted_memory)
+                self._resolved_paths = {
+                    p: k for p, k in self._resolved_paths.items() if k != evicted_key
+                }
+
+        if self.on_evict is not None:
+            for evicted_memory in evicted:
+                self.on_evict(evicted_memory)
+
+        return memory
+
+    def clear(self):
+        "Empty the pool."
+        with self._lock:
+            evicted = list(self._memories.values())
+            self._memories.clear()
+            self._resolved_paths.clear()
+
+        if self.on_evict is not None:
+            for evicted_memory in evicted:
+                self.on_evict(evicted_memory)
+
+
+class SingleFlight:
+    """
+    Deduplication of concurrent identical calls within a process.
+
+    The first thread calling do(key, ...) runs the call, and the threads
+    calling do(key, ...) with the same key while it runs wait for it,
+    then reuse its results (or raise its exception).
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        "Forget the running calls (e.g. in child processes created by os.fork(), which do not run them)."
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func, *args):
+        "Return func(*args), or the results of the identical call already running for 'key'."
+        with self._lock:
+            flight = self._flights.get(key)
+            is_leader = flight is None
+            if is_leader:
+                flight = self._flights[key] = _Flight()
+
+        if not is_leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.results
+
+        try:
+            flight.results = func(*args)
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+        return flight.results
+
+
+class _Flight:
+    "Call run by a SingleFlight."
+
+    __slots__ = ("done", "results", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.results = None
+        self.error = None
+
+
+# Shared by all cachers, so that identical calls are deduplicated
+# even across cachers caching at the same location
+_single_flight = SingleFlight()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_single_flight.reset)
+
+# Cachers, whose executors are replaced in child processes created by os.fork()
+_cachers = weakref.WeakSet()
+
+
+def _reset_cacher_executors():
+    "Replace the executors of the cachers (inherited without their threads by forked child processes)."
+    for cacher in list(_cachers):
+        executor = cacher._executor
+        # executors passed to the cacher are replaced by thread pools of the same size
+        cacher._executor = (
+            None if executor is None or cacher._owns_executor
+            else ThreadPoolExecutor(
+                getattr(executor, "_max_workers", None), thread_name_prefix="cachecache"
+            )
+        )
+        cacher._executor_lock = threading.Lock()
+
 
-    # Get function signature
-    sig = inspect.signature(func)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_cacher_executors)
 
-    # Identify all positional and keyword arguments
-    arg_kwarg_names = [param.name for param in sig.parameters.values()]
-    wrong_kwargs = [name for name in kwargs.keys() if name not in arg_kwarg_names]
-    assert (
-        len(wrong_kwargs) == 0
-    ), f"{func.__name__}() got >=1 unexpected keyword argument(s): {wrong_kwargs}"
 
-    # Add arguments PASSED as positional arguments, in args
-    # (they can be defined either as positional or keyword arguments!)
-    args_kwargs = {}
-    for i, value in enumerate(args):
-        name = arg_kwarg_names[i]
-        args_kwargs[name] = value
-        args_kwargs[name + "_arg_index"] = i
+class MemoryTier:
+    """
+    Bounded, thread-safe in-process store of function results,
+    checked by Cacher before its disk store.
 
-    # Add arguments PASSED as keyword arguments, in kwargs
-    # (they can be defined either as positional or keyword arguments!)
-    args_kwargs = {**args_kwargs, **kwargs}
+    Results are held until the sum of their estimated sizes exceeds 'max_bytes',
+    at which point the least recently used results are dropped.
+    Results are shared, not copied: mutating a result returned by a cached function
+    alters the result returned by the next calls served by the memory tier.
 
-    # Add keyword arguments NOT PASSED, with default values
-    for name, param in sig.parameters.items():
-        if (name not in args_kwargs) and \
-           (param.default is not inspect.Parameter.empty):
-            args_kwargs[name] = param.default
+    Arguments:
+        - max_bytes: int, maximum size of the stored results, in bytes
+    """
 
-    return args_kwargs
+    def __init__(self, max_bytes: int):
+        self.max_bytes = int(max_bytes)
+        self.nbytes = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def get(self, key, default=None):
+        "Return the result stored at 'key' (default if not found)."
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return default
+            self._items.move_to_end(key)
+            return item[0]
+
+    def put(self, key, value):
+        "Store 'value' at 'key', dropping the least recently used results if needed."
+        nbytes = estimate_size(value)
+        with self._lock:
+            self._pop(key)
+            if nbytes > self.max_bytes:
+                return
+            self._items[key] = (value, nbytes)
+            self.nbytes += nbytes
+            while self.nbytes > self.max_bytes:
+                _, (_, evicted_nbytes) = self._items.popitem(last=False)
+                self.nbytes -= evicted_nbytes
+
+    def pop(self, key):
+        "Drop the result stored at 'key', if any."
+        with self._lock:
+            self._pop(key)
+
+    def _pop(self, key):
+        item = self._items.pop(key, None)
+        if item is not None:
+            self.nbytes -= item[1]
+
+    def pop_where(self, predicate):
+        "Drop the results whose key satisfies 'predicate'."
+        with self._lock:
+            for key in [key for key in self._items if predicate(key)]:
+                self._pop(key)
+
+    def clear(self):
+        "Drop all results."
+        with self._lock:
+            self._items.clear()
+            self.nbytes = 0
 
 
 class Cacher:
@@ -68,10 +456,105 @@ class Cacher:
         - cache_results: bool, whether to cache the results
                          (if False, does not attempt to load form cache either)
         - cache_path: None|str, set alternative cache directory at run time
+        - memory_tier: None|bool, whether to use the in-memory tier of the cacher
+                       (if None, uses it if the cacher has one, i.e. if memory_tier_bytes > 0)
+        - max_age: None|float, max age of the cached results to reload, in seconds
+                   (older results are recomputed and overwrite the cache)
+        - mmap_mode: None|False|str, memory-mapping mode of the numpy arrays reloaded from the cache
+                     (if None, the mmap_mode of the cacher, if False, arrays are loaded in memory)
 
     *** Arguments ***
         - cache_path: directory to cache the results of functions decorated with cacher = Cacher().
         - caching_memory_allocation: int, max size of cache in bytes.
+        - memory_pool_size: int, max number of caches opened at run time with 'cache_path'
+                            kept open for later calls (least recently used ones are closed first).
+        - memory_tier_bytes: int, size in bytes of the in-memory tier
+                             holding recently loaded or computed results in RAM,
+                             checked before the disk cache (disabled if 0, the default).
+        - lazy: bool, whether to open the cache (write permission and disk space checks,
+                directory creation, cache size enforcement) at first use rather than right away.
+        - eviction_policy: str, which cached results to evict first when the cache is full:
+            - "lru": the least recently used results,
+            - "cost": the results saving the least computation time per byte,
+                      weighted by how recently they were used (GreedyDual-Size policy),
+                      so that small results long to compute are kept over large results quick to compute.
+                      Requires the index of the cache (falls back to "lru" without it).
+        - use_index: bool, whether to keep an SQLite index of the cached items in the cache directory
+                     (sizes, access times, hits...), so that the cache is sized and evicted from
+                     without walking its directory, and its items listed (see Cacher.cached_items).
+                     The index is in WAL mode on local filesystems, and in rollback journal mode
+                     on network filesystems (e.g. NFS). If False, or if the index fails
+                     (e.g. locked by another process), the cache directory is walked instead.
+        - ttl: None|float, time to live of cached results in seconds - older results are recomputed
+               (can be set for each decorated function with @cacher(ttl=...)).
+        - lock_across_processes: bool, whether to compute missing results in a single process
+                                 when several processes (possibly on several machines sharing the cache
+                                 directory, e.g. over NFS) call a function with the same arguments:
+                                 the first process takes a lease lock on the call, and the others
+                                 wait for its results to be written to the cache.
+        - lock_lease_duration: float, time after which the lock of a process
+                               that stopped refreshing it (e.g. crashed) is taken over, in seconds
+        - lock_poll_interval: float, interval at which waiting processes check for the results, in seconds
+        - write_behind: bool, whether to return computed results right away and write them
+                        to the disk cache in the background (calls with the same arguments
+                        are served from memory until the results are written).
+                        Use cacher.flush() to wait until all results are written
+                        (pending results are also written when the interpreter exits).
+        - write_behind_workers: int, number of background threads writing results
+        - write_behind_max_pending: int, maximum number of results waiting to be written
+                                    (calls computing new results block while the queue is full)
+        - executor: None|concurrent.futures.ThreadPoolExecutor, thread pool computing the calls
+                    submitted with cached_func.submit(...) (if None, a thread pool created at first use).
+                    Process pools are not supported: submitted calls share the state of the cacher
+                    (locks, memory tier, single-flight...), which cannot be sent to other processes.
+                    In child processes created by os.fork(), it is replaced by a thread pool
+                    of the same size (the threads of the executor are not inherited).
+        - compress: bool|int|str|tuple, compression of the cached results
+                    (can be set for each decorated function with @cacher(compress=...)):
+            - False: no compression (the default),
+            - True|int: zlib compression (at level 3, or at the given level from 1 to 9),
+            - str|(str, int): compression codec ("zlib", "gzip", "bz2", "lzma", "xz",
+                              "lz4" (requires lz4) or "zstd" (requires zstandard)), and level,
+            - "auto": the codec is picked for each decorated function, by compressing
+                      its first results with several codecs and keeping the one minimizing
+                      their expected load time (read time from the disk of the cache plus
+                      decompression time). Smaller results load faster from slow disks (e.g. NFS),
+                      while uncompressed results load faster from fast disks.
+                      Note: results memory-mapped at load time (mmap_mode) are not compressed.
+        - hooks: None|list, functions called with the CallEvent of every call of the cached functions
+                 (and await of the cached coroutine functions), once it returns or raises,
+                 holding the outcome of the call and the duration of each of its stages
+                 (binding arguments, selecting the cache, hashing arguments, cache lookup,
+                 deserialization, computation and writing), see Cacher.add_hook.
+        - fast_keys: bool, whether to hash calls whose arguments are only primitives (None, bools,
+                     ints, floats, strings, bytes), tuples, lists, dicts and pathlib paths
+                     without joblib's pickle-based hasher (see cachecache.keys.FastKey),
+                     which is much faster. Other calls are hashed by joblib.
+                     Off by default, as the keys of these calls differ from joblib's: results cached
+                     with fast_keys=False (including by earlier versions of cachecache)
+                     are not found with fast_keys=True, and conversely.
+        - digest_keys: bool, whether to hash numpy arrays of at least 'hash_memo_min_bytes' bytes
+                       into a digest of their content (see cachecache.hash_memo.tree_digest),
+                       hashed in place of the arrays into the keys of the calls, rather than hashing
+                       the arrays with joblib's hasher. Digests can be computed across several threads
+                       (see hash_threads), and do not depend on the number of threads, so keys do not either.
+                       Note: keys of calls with such arguments differ from the keys computed with
+                       digest_keys=False, so all the processes sharing a cache should use the same setting.
+        - hash_memo: bool, whether to hash large arguments once for as long as they are alive
+                     and known to be unchanged, rather than at every call (see cachecache.hash_memo.HashMemo):
+                     large numpy arrays are hashed into a digest (as with digest_keys, which hash_memo implies),
+                     reused in later calls if they are read-only
+                     (array.flags.writeable = False, as well as the arrays they are views of),
+                     and other objects can be given a version with cacher.declare_version(obj, version).
+                     Note: keys of calls with such arguments differ from the keys computed with hash_memo=False.
+        - hash_memo_min_bytes: int, size from which numpy arrays are hashed into a digest, in bytes
+        - hash_threads: int, number of threads computing the digests of large numpy arrays
+                        (e.g. os.cpu_count()), in chunks hashed in parallel.
+                        Requires digest_keys=True or hash_memo=True.
+        - mmap_mode: None|str, memory-mapping mode of the numpy arrays found in reloaded results
+                     (None, "r+", "r", "w+" or "c", see numpy.load): large arrays are then reloaded
+                     almost instantly, and shared through the page cache across processes.
+                     Use "r" (read-only) unless the cached arrays are meant to be modified in place.
 
     *** Returns ***
         - cacher: the caching decorator.
@@ -103,7 +586,7 @@ class Cacher:
 
         # for caching at "my/custom/caching/path",
         # with a maximum cache size of 10 GB
-        # behind the scenes, "cache" is simply defined as "cache = Cacher()"
+        # behind the scenes, "cache" is simply defined as "cache = Cacher(lazy=True)"
         @Cacher("my/custom/caching/path", 10e9)
         def my_cached_function(...
 
@@ -132,21 +615,183 @@ class Cacher:
         # Optionally, we can adjust the caching directory at run time
         result = my_cached_function(arg, cache_path="somewhere/else")
 
+        # Optionally, recently used results can be kept in RAM
+        # (here up to 2GB), to skip reloading them from disk
+        @Cacher("my/custom/caching/path", memory_tier_bytes=2e9)
+        def my_cached_function(...
+        result = my_cached_function(arg, memory_tier=False) # bypass the memory tier
+
+        # Optionally, cached results can expire after some time (here 1 hour)
+        @cacher(ttl=3600)
+        def my_cached_function(...
+        # and fresh enough results can be required at run time (here less than 1 minute old)
+        result = my_cached_function(arg, max_age=60)
+
+        # Optionally, numpy arrays can be memory-mapped rather than loaded in RAM
+        cacher = Cacher("my/custom/caching/path", mmap_mode="r")
+        result = my_cached_function(arg, mmap_mode=False) # load in RAM at run time
+
+        # Optionally, cached results can be compressed (here with zstd, at level 3)
+        @cacher(compress=("zstd", 3))
+        def my_cached_function(...
+
+        # Statistics of the calls (hits, misses, bytes read and written, latency of each stage...)
+        my_cached_function.cache_stats() # of a function
+        cacher.stats() # of all the functions of the cacher
+
+        # Hooks are called with the CallEvent of every call (outcome, duration of each stage...)
+        cacher.add_hook(lambda event: print(event.func.__name__, event.outcome, event.timings))
+
+        # Coroutine functions are cached too (disk I/O runs in the executor of the event loop)
+        @cacher
+        async def my_cached_coroutine(...
+        result = await my_cached_coroutine(arg)
+
     Note: initializing a cacher has potentially non-neglectible overhead,
-    so it is better practice to instanciate a single cacher to use across functions
-    rather than resorting to using the 'cache_path' argument at run time,
-    especially for functions that are intented to be called many times.
+    so it is better practice to instanciate a single cacher to use across functions.
+    Caches opened at run time with the 'cache_path' argument are kept in a pool
+    of 'memory_pool_size' caches, so only the first call with a given 'cache_path' pays this overhead.
     """
 
     def __init__(
         self,
         cache_path: Union[str, Path] = default_cache_path,
         caching_memory_allocation: Union[int, None] = None,
+        memory_pool_size: int = 32,
+        memory_tier_bytes: int = 0,
+        lazy: bool = False,
+        eviction_policy: str = "lru",
+        ttl: Union[float, None] = None,
+        lock_across_processes: bool = False,
+        lock_lease_duration: float = 60.0,
+        lock_poll_interval: float = 0.5,
+        write_behind: bool = False,
+        write_behind_workers: int = 1,
+        write_behind_max_pending: int = 8,
+        executor: Optional[ThreadPoolExecutor] = None,
+        mmap_mode: Optional[str] = None,
+        compress: Union[bool, int, str, tuple] = False,
+        hooks: Optional[list] = None,
+        fast_keys: bool = False,
+        hash_memo: bool = False,
+        hash_memo_min_bytes: int = 2**20,
+        hash_threads: int = 1,
+        use_index: bool = True,
+        digest_keys: bool = False,
     ):
-        self.global_cache_memory = self.instanciate_joblib_cache(
-            cache_path, caching_memory_allocation
-        )
+        if eviction_policy not in EVICTION_POLICIES:
+            raise ValueError(
+                f"eviction_policy must be one of {EVICTION_POLICIES}, not '{eviction_policy}'."
+            )
+        if mmap_mode not in MMAP_MODES:
+            raise ValueError(f"mmap_mode must be one of {MMAP_MODES}, not '{mmap_mode}'.")
+        compress = check_compress(compress)
+        _check_executor(executor)
+        if hash_threads > 1 and not (digest_keys or hash_memo):
+            raise ValueError(
+                "hash_threads > 1 requires digest_keys=True or hash_memo=True "
+                "(arrays are hashed across threads into digests, which changes the keys of calls)."
+            )
+        self.cache_path = cache_path
         self.input_caching_memory_allocation = caching_memory_allocation
+        self.eviction_policy = eviction_policy
+        self.use_index = use_index
+        self.ttl = ttl
+        self.lock_across_processes = lock_across_processes
+        self.lock_lease_duration = lock_lease_duration
+        self.lock_poll_interval = lock_poll_interval
+        self.mmap_mode = mmap_mode
+        self.compress = compress
+        self.fast_keys = fast_keys
+        self.digest_keys = digest_keys or hash_memo
+
+        # digests of large arguments hashed into the keys of calls (if digest_keys or hash_memo),
+        # reused across calls while they are alive and unchanged (if hash_memo),
+        # and hashed in chunks across threads (if hash_threads > 1)
+        self.hash_memo = (
+            HashMemo(hash_memo_min_bytes, n_threads=hash_threads, memoize=hash_memo)
+            if self.digest_keys else None
+        )
+
+        # functions called with the CallEvent of every call
+        # (replaced rather than mutated, so that calls iterate over them without locking)
+        self.hooks = tuple(hooks or ())
+
+        # global cache, opened at first use if lazy
+        self._global_cache_memory = _MISSING
+        self._global_cache_memory_lock = threading.Lock()
+
+        # caches opened at run time with 'cache_path'
+        # (no way to customize the allocated cache memory for these caches)
+        self.memory_pool = MemoryPool(
+            functools.partial(self.instanciate_joblib_cache, caching_memory_allocation=None),
+            maxsize=memory_pool_size,
+            on_evict=self._forget_memory,
+        )
+
+        # deduplication of concurrent identical calls (and awaits)
+        self._single_flight = _single_flight
+        self._async_flights = {}
+
+        # results computed but not written to the disk cache yet
+        self.write_behind = (
+            WriteBehind(write_behind_workers, write_behind_max_pending) if write_behind else None
+        )
+
+        # executor computing the calls submitted with cached_func.submit(...)
+        # (a thread pool created at first use if None)
+        self._executor = executor
+        self._executor_lock = threading.Lock()
+        self._owns_executor = False
+        _cachers.add(self)
+
+        # in-memory results, checked before the disk cache
+        self.memory_tier = MemoryTier(memory_tier_bytes) if memory_tier_bytes else None
+
+        # joblib MemorizedFunc objects, built once per
+        # (function, cache location, ignored arguments, memory-mapping mode, compression),
+        # at most MAX_MEMORIZED_FUNCS (least recently used dropped first),
+        # dropped with their cache when it leaves the memory pool
+        self._memorized_funcs = OrderedDict()
+        self._memorized_funcs_lock = threading.Lock()
+
+        # statistics of the calls of each decorated function
+        self._function_stats = {}
+        self._function_stats_lock = threading.Lock()
+
+        if not lazy:
+            self._global_cache_memory = self.instanciate_joblib_cache(
+                cache_path, caching_memory_allocation
+            )
+
+    @property
+    def global_cache_memory(self):
+        "joblib Memory object of the global cache of the cacher (None if not writable)."
+        if self._global_cache_memory is _MISSING:
+            with self._global_cache_memory_lock:
+                if self._global_cache_memory is _MISSING:
+                    self._global_cache_memory = self.instanciate_joblib_cache(
+                        self.cache_path, self.input_caching_memory_allocation
+                    )
+
+        return self._global_cache_memory
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        "Executor computing the calls submitted with cached_func.submit(...)."
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(thread_name_prefix="cachecache")
+                    self._owns_executor = True
+
+        return self._executor
+
+    @executor.setter
+    def executor(self, executor: ThreadPoolExecutor):
+        _check_executor(executor)
+        self._executor = executor
+        self._owns_executor = False
 
     def __repr__(self):
         path = self.global_cache_memory.__repr__().split("=")[-1][:-1]
@@ -157,15 +802,34 @@ class Cacher:
             f"with a maximum allocation of {memo}GB."
         )
 
-    def __call__(self, func):
-        "Calling cacher returns the decorated (cached) function."
-        return self._decorator(func)
+    def __call__(
+        self, func=None, *, ttl: Union[float, None] = None, compress: Union[bool, int, str, tuple, None] = None
+    ):
+        """
+        Calling cacher returns the decorated (cached) function.
 
-    def _decorator(self, func_to_cache):
+        Options specific to the decorated function can be passed as keyword arguments,
+        in which case the decorator is returned:
+            @cacher(ttl=3600, compress="lz4")
+            def my_cached_function(...
+        """
+        if func is None:
+            return functools.partial(self.__call__, ttl=ttl, compress=compress)
+
+        return self._decorator(func, ttl=ttl, compress=compress)
+
+    def _decorator(
+        self, func_to_cache, ttl: Union[float, None] = None, compress: Union[bool, int, str, tuple, None] = None
+    ):
         """
         Decorator to cache any function at cache_path,
         with a memory allocation of caching_memory_allocation.
 
+        - ttl: None|float, time to live of the cached results of the function, in seconds
+               (if None, the ttl of the cacher)
+        - compress: None|bool|int|str|tuple, compression of the cached results of the function
+                    (if None, the compression of the cacher)
+
         Importantly, the cache behaviour can be altered by
         the following optional function arguments at run time:
             - again: bool, whether to recompute and overwrite the cached results
@@ -173,6 +837,11 @@ class Cacher:
             - cache_results: bool, whether to cache the computed results
                              (if False, does not attempt to load form cache either)
             - cache_path: None|str, set alternative path to cache directory at run time
+            - memory_tier: None|bool, whether to use the in-memory tier of the cacher
+            - max_age: None|float, max age of the cached results to reload, in seconds
+                       (older results are recomputed and overwrite the cache)
+            - mmap_mode: None|False|str, memory-mapping mode of the numpy arrays reloaded from the cache
+                         (if None, the mmap_mode of the cacher, if False, arrays are loaded in memory)
         """
         assert callable(func_to_cache), f"{func_to_cache} is not callable!"
 
@@ -181,57 +850,1131 @@ class Cacher:
         if '__main__' in func_to_cache.__module__:
             func_to_cache.__module__ = 'cachecache_persistent'
 
-        @functools.wraps(func_to_cache)
-        def cached_func(*args, **kwargs):
+        # Inspect the signature once, at decoration time.
+        # Arguments that alter caching behavior are ignored by the cache
+        # only if they exist in the function signature
+        binder = get_signature_binder(func_to_cache)
+        arguments_to_ignore = [k for k in CACHING_ARGUMENTS if k in binder.names]
+
+        if ttl is None:
+            ttl = self.ttl
+        compress = self.compress if compress is None else check_compress(compress)
+
+        if inspect.iscoroutinefunction(func_to_cache):
+            return self._async_decorator(func_to_cache, binder, arguments_to_ignore, ttl, compress)
+
+        stats = self._get_function_stats(func_to_cache)
+
+        def cached_call(args, kwargs):
 
             # Pull arguments that alter caching behavior
             cache_results = kwargs.get("cache_results", True)
             again = kwargs.get("again", False)
             cache_path = kwargs.get("cache_path", None)
+            memory_tier = kwargs.get("memory_tier", None)
+            max_age = kwargs.get("max_age", None)
+            mmap_mode = _resolve_mmap_mode(self.mmap_mode, kwargs.get("mmap_mode", None))
 
             # If cache_results is False, return the function unaltered
             if not cache_results:
+                stats.record("bypasses")
                 return func_to_cache(*args, **kwargs)
 
             # Define cache, global or custom
-            if cache_path is None:
-                cache_memory = self.global_cache_memory
-            else:
-                # no way to customize the allocated cache memory for cache initialized at function run time
-                cache_memory = self.instanciate_joblib_cache(
-                    cache_path, caching_memory_allocation=None
-                )
-            
+            start_time = time.perf_counter()
+            cache_memory = self.get_cache_memory(cache_path)
+            select_time = time.perf_counter() - start_time
+
             # If path not writable, cache_memory will be None
             # so return the function unaltered
             if cache_memory is None:
+                stats.record("bypasses")
                 return func_to_cache(*args, **kwargs)
 
             # Cache function, ignoring arguments that alter caching behavior
-            # only if they exist in the function signature
-            arg_kwargs = make_arg_kwargs_dic(func_to_cache, args, kwargs)
-            arguments_to_ignore = [
-                k for k in ["again", "cache_results", "cache_path"] if k in arg_kwargs
-            ]
-            func_to_cache_cached = cache_memory.cache(
-                func_to_cache, ignore=arguments_to_ignore
+            start_time = time.perf_counter()
+            binder.bind(args, kwargs)
+            bind_end_time = time.perf_counter()
+            func_to_cache_cached = self._get_memorized_func(
+                func_to_cache, cache_memory, arguments_to_ignore, mmap_mode, compress
+            )
+            record_stage("bind", bind_end_time - start_time)
+            record_stage("select", select_time + time.perf_counter() - bind_end_time)
+            event = current_event.get()
+            if event is not None:
+                event.location = str(cache_memory.location)
+
+            return self._call_memorized_func(
+                cache_memory, func_to_cache_cached, args, kwargs,
+                again, memory_tier, ttl, max_age
             )
 
-            # Reload or recompute results
-            mem = func_to_cache_cached.call_and_shelve(*args, **kwargs)
+        @functools.wraps(func_to_cache)
+        def cached_func(*args, **kwargs):
+            if not self.hooks:
+                return cached_call(args, kwargs)
+
+            # Record the stages of the call in a CallEvent, passed to the hooks once done
+            event = CallEvent(func_to_cache)
+            token = current_event.set(event)
+            try:
+                return cached_call(args, kwargs)
+            except BaseException as e:
+                event.error = e
+                raise
+            finally:
+                current_event.reset(token)
+                self._emit(event)
+
+        def submit_call(args, kwargs):
+            cache_results = kwargs.get("cache_results", True)
+            again = kwargs.get("again", False)
+            memory_tier = kwargs.get("memory_tier", None)
+            max_age = kwargs.get("max_age", None)
+            mmap_mode = _resolve_mmap_mode(self.mmap_mode, kwargs.get("mmap_mode", None))
 
-            # If again is True, clear the cache to enforce recomputing the results
-            if again:
-                mem.clear()
+            # Calls run by the executor in the context of the submission
+            # (which holds the CallEvent of the call, if any)
+            context = contextvars.copy_context()
 
-            # Reload results (or recompute them if again was True)
-            mem = func_to_cache_cached.call_and_shelve(*args, **kwargs)
-            results = mem.get()
+            start_time = time.perf_counter()
+            cache_memory = self.get_cache_memory(kwargs.get("cache_path", None)) if cache_results else None
+            select_time = time.perf_counter() - start_time
+            if cache_memory is None:
+                stats.record("bypasses")
+                return self.executor.submit(context.run, func_to_cache, *args, **kwargs)
+
+            start_time = time.perf_counter()
+            binder.bind(args, kwargs)
+            bind_end_time = time.perf_counter()
+            func_to_cache_cached = self._get_memorized_func(
+                func_to_cache, cache_memory, arguments_to_ignore, mmap_mode, compress
+            )
+            record_stage("bind", bind_end_time - start_time)
+            record_stage("select", select_time + time.perf_counter() - bind_end_time)
+            event = current_event.get()
+            if event is not None:
+                event.location = str(cache_memory.location)
+            call_id = self._call_id(func_to_cache_cached, args, kwargs)
+
+            tier = self.memory_tier if memory_tier is not False else None
+            if not again and tier is not None:
+                results = self._get_fresh(
+                    tier, self._tier_key(func_to_cache_cached, call_id),
+                    _age_limit(ttl, max_age), stats, cache_memory.size_tracker
+                )
+                if results is not _MISSING:
+                    future = Future()
+                    future.set_result(results)
+                    return future
+
+            return self.executor.submit(
+                context.run, self._call_memorized_func,
+                cache_memory, func_to_cache_cached, args, kwargs,
+                again, memory_tier, ttl, max_age, call_id
+            )
 
-            return results
+        def submit(*args, **kwargs):
+            """
+            Submit a call to the cached function, returning a concurrent.futures.Future
+            holding its results. Results held by the memory tier are returned right away
+            (the returned future is done), while cached results are reloaded from the disk cache
+            and missing results are computed by the executor of the cacher (cacher.executor),
+            so that the disk I/O of many submitted calls overlaps.
+            Arguments that alter caching behavior at run time are handled as by the cached function.
+            """
+            if not self.hooks:
+                return submit_call(args, kwargs)
+
+            # Record the stages of the call in a CallEvent, passed to the hooks once the future is done
+            event = CallEvent(func_to_cache)
+            with self._recording(event):
+                try:
+                    future = submit_call(args, kwargs)
+                except BaseException:
+                    self._emit(event)
+                    raise
+            future.add_done_callback(functools.partial(self._emit_future, event))
+            return future
+
+        def map(
+            iterable_of_args, n_jobs=None, prefer="threads", again=False, cache_path=None, mmap_mode=None
+        ):
+            """
+            Call the cached function over an iterable of arguments,
+            computing only the calls not found in the cache, in parallel.
+
+            Arguments:
+                - iterable_of_args: iterable of the arguments of each call:
+                    a tuple (or list) of positional arguments, a dict of keyword arguments,
+                    or any other object as the single positional argument.
+                - n_jobs: None|int, number of parallel jobs computing the missing results
+                          (joblib.Parallel convention: None means 1, -1 means all CPUs)
+                - prefer: str, "threads" or "processes", computing missing results
+                          in a pool of threads or of processes
+                - again: bool, whether to recompute and overwrite the cached results
+                - cache_path: None|str, set alternative path to cache directory
+                - mmap_mode: None|False|str, memory-mapping mode of the numpy arrays of the results
+                             (if None, the mmap_mode of the cacher, if False, arrays are loaded in memory)
+
+            Returns:
+                - results: list of the results of each call, in input order.
+            """
+            return self._map(
+                func_to_cache, arguments_to_ignore, ttl, compress,
+                iterable_of_args, n_jobs, prefer, again, cache_path,
+                _resolve_mmap_mode(self.mmap_mode, mmap_mode)
+            )
+
+        cached_func.submit = submit
+        cached_func.map = map
+        # statistics of the calls of the cached function (see CacheStats.snapshot)
+        cached_func.cache_stats = stats.snapshot
 
         return cached_func
 
+    def _async_decorator(self, func_to_cache, binder, arguments_to_ignore, ttl, compress):
+        """
+        Decorator caching the results of a coroutine function (async def),
+        awaited on cache misses (see _decorator).
+        """
+
+        stats = self._get_function_stats(func_to_cache)
+
+        async def async_cached_call(args, kwargs):
+
+            # Pull arguments that alter caching behavior
+            cache_results = kwargs.get("cache_results", True)
+            again = kwargs.get("again", False)
+            cache_path = kwargs.get("cache_path", None)
+            memory_tier = kwargs.get("memory_tier", None)
+            max_age = kwargs.get("max_age", None)
+            mmap_mode = _resolve_mmap_mode(self.mmap_mode, kwargs.get("mmap_mode", None))
+
+            # If cache_results is False, return the function unaltered
+            if not cache_results:
+                stats.record("bypasses")
+                return await func_to_cache(*args, **kwargs)
+
+            # Define cache, global or custom
+            # (opening a cache hits the disk, so it runs in the executor of the event loop)
+            start_time = time.perf_counter()
+            cache_memory = await self._run_in_executor(self.get_cache_memory, cache_path)
+            select_time = time.perf_counter() - start_time
+
+            # If path not writable, cache_memory will be None
+            # so return the function unaltered
+            if cache_memory is None:
+                stats.record("bypasses")
+                return await func_to_cache(*args, **kwargs)
+
+            # Cache function, ignoring arguments that alter caching behavior
+            start_time = time.perf_counter()
+            binder.bind(args, kwargs)
+            bind_end_time = time.perf_counter()
+            func_to_cache_cached = self._get_memorized_func(
+                func_to_cache, cache_memory, arguments_to_ignore, mmap_mode, compress
+            )
+            record_stage("bind", bind_end_time - start_time)
+            record_stage("select", select_time + time.perf_counter() - bind_end_time)
+            event = current_event.get()
+            if event is not None:
+                event.location = str(cache_memory.location)
+
+            return await self._async_call_memorized_func(
+                cache_memory, func_to_cache_cached, args, kwargs,
+                again, memory_tier, ttl, max_age
+            )
+
+        @functools.wraps(func_to_cache)
+        async def async_cached_func(*args, **kwargs):
+            if not self.hooks:
+                return await async_cached_call(args, kwargs)
+
+            # Record the stages of the await in a CallEvent, passed to the hooks once done
+            event = CallEvent(func_to_cache)
+            token = current_event.set(event)
+            try:
+                return await async_cached_call(args, kwargs)
+            except BaseException as e:
+                event.error = e
+                raise
+            finally:
+                current_event.reset(token)
+                self._emit(event)
+
+        # statistics of the calls of the cached function (see CacheStats.snapshot)
+        async_cached_func.cache_stats = stats.snapshot
+
+        return async_cached_func
+
+    def add_hook(self, hook):
+        """
+        Call 'hook' with the CallEvent of every call of the functions decorated by the cacher
+        (and await of the decorated coroutine functions), once it returns or raises.
+
+        The CallEvent holds the outcome of the call (hit, miss, refresh or bypass),
+        the directory of the cache it used, the bytes it read and wrote, and the duration
+        of each of its stages (see cachecache.stats.EVENT_STAGES), e.g. to find out whether
+        a slow call hashed a large argument, waited for a slow disk, or unpickled large results.
+        Hooks are called in the thread of the call: they should be fast, and exceptions they raise
+        are turned into warnings.
+
+        Usage:
+            def log_slow_calls(event):
+                if event.duration > 1:
+                    print(event.func.__name__, event.outcome, event.location, event.timings)
+
+            cacher.add_hook(log_slow_calls)
+        """
+        self.hooks = self.hooks + (hook,)
+
+    def remove_hook(self, hook):
+        "Stop calling 'hook' with the CallEvent of every call (see add_hook)."
+        self.hooks = tuple(h for h in self.hooks if h != hook)
+
+    def declare_version(self, obj, version):
+        """
+        Declare the version of 'obj' (any hashable value) to the hash memo of the cacher (see hash_memo):
+        obj is then hashed once, and its digest reused in later calls as long as its version is the same,
+        so the version must be changed whenever obj is modified. obj must support weak references.
+
+        Usage:
+            cacher = Cacher(hash_memo=True)
+            cacher.declare_version(dataframe, 1)
+            my_cached_function(dataframe) # hashes dataframe
+            my_cached_function(dataframe) # reuses its digest
+            dataframe.loc[0, "a"] = 2
+            cacher.declare_version(dataframe, 2)
+        """
+        if self.hash_memo is None or not self.hash_memo.memoize:
+            raise ValueError("declare_version requires a cacher with a hash memo (Cacher(hash_memo=True)).")
+        self.hash_memo.declare_version(obj, version)
+
+    @staticmethod
+    @contextlib.contextmanager
+    def _recording(event):
+        "Context in which the stages and outcome of a call are recorded in 'event' (if not None)."
+        if event is None:
+            yield
+            return
+        token = current_event.set(event)
+        try:
+            yield
+        except BaseException as e:
+            event.error = e
+            raise
+        finally:
+            current_event.reset(token)
+
+    def _emit_future(self, event, future):
+        "Pass the CallEvent of a submitted call to the hooks of the cacher, once its future is done."
+        if future.cancelled():
+            event.error = CancelledError()
+        elif future.exception() is not None:
+            event.error = future.exception()
+        self._emit(event)
+
+    def _emit(self, event):
+        "Pass the CallEvent of a finished call to the hooks of the cacher."
+        event.finish()
+        for hook in self.hooks:
+            try:
+                hook(event)
+            except Exception:
+                warnings.warn(f"cachecache hook {hook} raised an exception:\n{traceback.format_exc()}")
+
+    @staticmethod
+    def _run_in_executor(func, *args):
+        """
+        Run func(*args) in the default executor of the running event loop,
+        in the context of the current task (which holds the CallEvent of the current await, if any).
+        """
+        import asyncio
+
+        return asyncio.get_running_loop().run_in_executor(
+            None, functools.partial(contextvars.copy_context().run, func, *args)
+        )
+
+    def _get_function_stats(self, func):
+        "CacheStats of the calls of the decorated function 'func'."
+        with self._function_stats_lock:
+            return self._function_stats.setdefault(func, CacheStats())
+
+    def stats(self, per_function: bool = False) -> dict:
+        """
+        Statistics of the calls of all the functions decorated by the cacher:
+        numbers of hits, misses, refreshes and bypasses, bytes read and written,
+        and latency of each stage of the calls (see cachecache.stats.CacheStats.snapshot).
+
+        Arguments:
+            - per_function: bool, whether to return the statistics of each function,
+                            as a dictionnary {'module.function name': statistics}
+
+        Returns:
+            - stats: dict, statistics of the calls
+        """
+        with self._function_stats_lock:
+            function_stats = dict(self._function_stats)
+
+        if per_function:
+            return {
+                f"{func.__module__}.{func.__qualname__}": stats.snapshot()
+                for func, stats in function_stats.items()
+            }
+
+        total = CacheStats()
+        for stats in function_stats.values():
+            total.merge(stats)
+
+        return total.snapshot()
+
+    def reset_stats(self):
+        "Reset the statistics of the calls of all the functions decorated by the cacher."
+        with self._function_stats_lock:
+            function_stats = list(self._function_stats.values())
+        for stats in function_stats:
+            stats.reset()
+
+    def get_cache_memory(self, cache_path: Union[str, Path, None] = None):
+        """
+        Return the joblib Memory object caching at 'cache_path'
+        (the global cache of the cacher if None).
+        Returns None if 'cache_path' is not writable.
+        """
+        if cache_path is None:
+            return self.global_cache_memory
+
+        return self.memory_pool.get(cache_path)
+
+    def _get_func_memorized_func(self, func, memory):
+        "MemorizedFunc of the (possibly decorated) function 'func' in 'memory'."
+        func = getattr(func, "__wrapped__", func)
+        binder = get_signature_binder(func)
+        arguments_to_ignore = [k for k in CACHING_ARGUMENTS if k in binder.names]
+
+        return self._get_memorized_func(
+            func, memory, arguments_to_ignore, self.mmap_mode, self.compress
+        )
+
+    def cached_items(self, func=None, cache_path: Union[str, Path, None] = None):
+        """
+        List the items cached at 'cache_path' (the global cache of the cacher if None),
+        as found in the index of the cache.
+
+        Arguments:
+            - func: None|function, function decorated by the cacher
+                    (if None, lists the items of all functions)
+            - cache_path: None|str, path to the cache directory
+
+        Returns:
+            - items: list of dictionnaries with keys
+                     func_id, args_id, size (bytes), created, last_access (timestamps),
+                     hits and duration (time taken to compute the results, in seconds)
+        """
+        memory = self.get_cache_memory(cache_path)
+        if memory is None or memory.size_tracker.index is None:
+            return []
+
+        func_id = None if func is None else self._get_func_memorized_func(func, memory).func_id
+
+        return memory.size_tracker.entries(func_id)
+
+    def invalidate(self, func, cache_path: Union[str, Path, None] = None):
+        """
+        Remove all the cached results of 'func' at 'cache_path'
+        (the global cache of the cacher if None), on disk and in memory.
+
+        Arguments:
+            - func: function decorated by the cacher
+            - cache_path: None|str, path to the cache directory
+        """
+        memory = self.get_cache_memory(cache_path)
+        if memory is None:
+            return
+
+        memorized_func = self._get_func_memorized_func(func, memory)
+        if self.write_behind is not None:
+            # results not written yet are dropped, and results being written are waited for
+            location = str(memory.location)
+            self.write_behind.discard(
+                lambda key: key[0] == location and key[1] == memorized_func.func_id
+            )
+        memorized_func.clear(warn=False)
+        memory.size_tracker.remove_function(memorized_func.func_id)
+        if self.memory_tier is not None:
+            # (results reloaded with any memory-mapping mode)
+            store_location = str(memorized_func.store_backend.location)
+            self.memory_tier.pop_where(
+                lambda key: key[0] is memorized_func.func and key[1] == store_location
+            )
+
+    def _get_memorized_func(self, func, memory, ignore, mmap_mode=None, compress=False):
+        """
+        Return the joblib MemorizedFunc wrapping 'func' in 'memory',
+        ignoring the arguments listed in 'ignore',
+        reloading numpy arrays with memory-mapping mode 'mmap_mode',
+        and writing results compressed with 'compress'.
+
+        Wrapping a function with joblib (code inspection, func_code bookkeeping...)
+        is not free, so MemorizedFunc objects are built once and reused across calls.
+        """
+        key = (func, str(memory.location), tuple(ignore), mmap_mode, compress)
+        memorized_func = self._memorized_funcs.get(key)
+        if memorized_func is not None:
+            # least recently used MemorizedFunc objects are dropped first
+            with self._memorized_funcs_lock:
+                if key in self._memorized_funcs:
+                    self._memorized_funcs.move_to_end(key)
+        else:
+            with self._memorized_funcs_lock:
+                memorized_func = self._memorized_funcs.get(key)
+                if memorized_func is None:
+                    memorized_func = self._memorize(func, memory, ignore, mmap_mode, compress)
+                    memorized_func.stats = self._get_function_stats(func)
+                    memorized_func.fast_key = (
+                        FastKey(get_signature_binder(func), ignore) if self.fast_keys else None
+                    )
+                    memorized_func.hash_memo = self.hash_memo
+                    self._memorized_funcs[key] = memorized_func
+                    while len(self._memorized_funcs) > MAX_MEMORIZED_FUNCS:
+                        self._memorized_funcs.popitem(last=False)
+
+        return memorized_func
+
+    def _forget_memory(self, memory):
+        "Drop the MemorizedFunc objects caching in 'memory' (closed by the memory pool)."
+        location = str(memory.location)
+        with self._memorized_funcs_lock:
+            for key in [key for key in self._memorized_funcs if key[1] == location]:
+                del self._memorized_funcs[key]
+
+    @staticmethod
+    def _memorize(func, memory, ignore, mmap_mode=None, compress=False):
+        "Wrap 'func' in a joblib MemorizedFunc caching in 'memory' (see _get_memorized_func)."
+        # The codec picked by AutoCompression is applied at write time (see _write)
+        auto_compression = AutoCompression() if compress == "auto" else None
+        if auto_compression is not None:
+            compress = False
+
+        if mmap_mode == memory.mmap_mode and compress == memory.compress:
+            memorized_func = memory.cache(func, ignore=list(ignore))
+        else:
+            # joblib store backends memory-map and compress arrays with the modes they were
+            # configured with, so other modes require another store backend (at the same location)
+            from joblib.memory import MemorizedFunc
+            memorized_func = MemorizedFunc(
+                func,
+                location=memory.store_backend.location,
+                backend=memory.backend,
+                ignore=list(ignore),
+                mmap_mode=mmap_mode,
+                compress=compress,
+                verbose=0,
+                timestamp=memory.timestamp,
+            )
+        memorized_func.auto_compression = auto_compression
+
+        return memorized_func
+
+    def _call_memorized_func(
+        self, memory, memorized_func, args, kwargs,
+        again=False, memory_tier=None, ttl=None, max_age=None, call_id=None
+    ):
+        """
+        Reload or compute the results of a joblib MemorizedFunc call.
+
+        The arguments are hashed once (unless call_id is passed), and the function is run at most once:
+            - hit: results are loaded from the memory tier, or from the disk cache,
+            - miss: results are computed and cached,
+            - refresh (again=True, or cached results older than ttl or max_age):
+              results are recomputed and overwrite the cache.
+        Each hit loads its own copy of the cached results (except from the memory tier),
+        while concurrent identical calls missing results share the results computed once.
+        """
+        if call_id is None:
+            call_id = self._call_id(memorized_func, args, kwargs)
+
+        tier = self.memory_tier if memory_tier is not False else None
+        tier_key = self._tier_key(memorized_func, call_id)
+
+        # Cached results older than age_limit are treated as missing
+        age_limit = _age_limit(ttl, max_age)
+
+        if not again and tier is not None:
+            results = self._get_fresh(
+                tier, tier_key, age_limit, memorized_func.stats, memory.size_tracker
+            )
+            if results is not _MISSING:
+                return results
+
+        # Each call loads its own copy of cached results
+        if not again:
+            loaded = self._load(memory, memorized_func, call_id, age_limit)
+            if loaded is not None:
+                if tier is not None:
+                    tier.put(tier_key, loaded)
+                return loaded[0]
+
+        # Concurrent identical calls missing results within the process are computed only once,
+        # and share the computed results (refreshes and calls requiring fresher results
+        # do not join other calls)
+        flight_key = (
+            str(memory.location), *call_id, memorized_func.mmap_mode, again, age_limit, ttl
+        )
+        is_leader = []
+
+        def load_or_compute():
+            is_leader.append(True)
+            return self._load_or_compute(
+                memory, memorized_func, call_id, args, kwargs, again, age_limit, ttl
+            )
+
+        results, created = self._single_flight.do(flight_key, load_or_compute)
+        if not is_leader:
+            # served with the results of the identical call running concurrently
+            memorized_func.stats.record("hits")
+        if tier is not None:
+            tier.put(tier_key, (results, created))
+
+        return results
+
+    def _lookup(self, memory, memorized_func, call_id, memory_tier=None, age_limit=None):
+        """
+        Reload the results of a joblib MemorizedFunc call from the memory tier or the disk cache,
+        without computing them. Returns _MISSING if not cached (or older than age_limit).
+        """
+        tier = self.memory_tier if memory_tier is not False else None
+        tier_key = self._tier_key(memorized_func, call_id)
+        if tier is not None:
+            results = self._get_fresh(
+                tier, tier_key, age_limit, memorized_func.stats, memory.size_tracker
+            )
+            if results is not _MISSING:
+                return results
+
+        loaded = self._load(memory, memorized_func, call_id, age_limit)
+        if loaded is None:
+            return _MISSING
+        if tier is not None:
+            tier.put(tier_key, loaded)
+
+        return loaded[0]
+
+    @staticmethod
+    def _call_id(memorized_func, args, kwargs):
+        """
+        Hash the arguments of a joblib MemorizedFunc call into its call_id (func_id, args_id),
+        with its FastKey if the arguments are supported, else with joblib's hasher
+        (large arguments being replaced by their digest first, if the cacher has a HashMemo).
+        """
+        start_time = time.perf_counter()
+        if memorized_func.hash_memo is not None:
+            args, kwargs = memorized_func.hash_memo.substitute(args, kwargs)
+        fast_key = memorized_func.fast_key
+        args_id = None if fast_key is None else fast_key.args_id(args, kwargs)
+        if args_id is None:
+            args_id = memorized_func._get_args_id(*args, **kwargs)
+        memorized_func.stats.record_time("hash", time.perf_counter() - start_time)
+
+        return memorized_func.func_id, args_id
+
+    @staticmethod
+    def _tier_key(memorized_func, call_id):
+        """
+        Key of the results of a joblib MemorizedFunc call in the memory tier:
+        (function, cache location, memory-mapping mode, func_id, args_id).
+        The function is part of the key, so that results of a redefined function
+        (e.g. in a notebook) are not served, but the MemorizedFunc is not,
+        as it may be dropped and rebuilt (see MAX_MEMORIZED_FUNCS).
+        """
+        return (
+            memorized_func.func, str(memorized_func.store_backend.location),
+            memorized_func.mmap_mode, *call_id,
+        )
+
+    @staticmethod
+    def _get_fresh(tier, tier_key, age_limit=None, stats=None, size_tracker=None):
+        """
+        Results held by the memory tier at 'tier_key', or _MISSING if absent or older than age_limit.
+        - stats: None|CacheStats, statistics recording the lookup (and the hit)
+        - size_tracker: None|CacheSizeTracker, size tracker of the disk cache, recording the hit
+                        (so that results used from RAM are not evicted from the disk cache first)
+        """
+        start_time = time.perf_counter()
+        results, created = tier.get(tier_key, (_MISSING, None))
+        if results is not _MISSING and (
+            age_limit is not None and (created is None or time.time() - created > age_limit)
+        ):
+            results = _MISSING
+
+        if stats is not None:
+            stats.record_time("lookup", time.perf_counter() - start_time)
+            if results is not _MISSING:
+                stats.record("hits")
+        if size_tracker is not None and results is not _MISSING:
+            # (written to the index in batches, as hits of the disk cache)
+            size_tracker.record_access(tier_key[3:])
+
+        return results
+
+    def _load_or_compute(
+        self, memory, memorized_func, call_id, args, kwargs, again, age_limit, ttl
+    ):
+        """
+        Reload the results of a joblib MemorizedFunc call from the disk cache,
+        or compute and cache them (if again is True, if not cached,
+        or if cached results are older than age_limit).
+        Returns the results and their creation time (None if unknown).
+
+        If the cacher locks calls across processes, the results are computed
+        by a single process (holding the lease lock of the call),
+        while other processes wait for the results to be written to the cache.
+        """
+        if again:
+            # Keep joblib's function code bookkeeping up to date
+            # (it is otherwise handled by the cache lookup)
+            memorized_func._check_previous_func_code(stacklevel=5)
+        else:
+            loaded = self._load(memory, memorized_func, call_id, age_limit)
+            if loaded is not None:
+                return loaded
+
+        if not self.lock_across_processes:
+            memorized_func.stats.record("refreshes" if again else "misses")
+            return self._compute(memory, memorized_func, call_id, args, kwargs, ttl)
+
+        # Results written after this point are fresh enough, even if again is True
+        start_time = time.time()
+        lock = LeaseLock(self._lock_path(memory, call_id), self.lock_lease_duration)
+        while not lock.acquire():
+            time.sleep(self.lock_poll_interval)
+            loaded = self._load(
+                memory, memorized_func, call_id, time.time() - start_time if again else age_limit
+            )
+            if loaded is not None:
+                return loaded
+
+        try:
+            # Results may have been written by another process
+            # between the last lookup and the lock acquisition
+            loaded = self._load(
+                memory, memorized_func, call_id, time.time() - start_time if again else age_limit
+            )
+            if loaded is not None:
+                lock.release()
+                return loaded
+
+            # The lock is released once the results are written
+            memorized_func.stats.record("refreshes" if again else "misses")
+            return self._compute(memory, memorized_func, call_id, args, kwargs, ttl, lock)
+        except BaseException:
+            lock.release()
+            raise
+
+    def _load(self, memory, memorized_func, call_id, age_limit=None):
+        """
+        Reload the results of a joblib MemorizedFunc call from the disk cache
+        (or from memory, if still waiting to be written to the disk cache).
+        Returns the results and their creation time (None if unknown),
+        or None if not cached, or if cached results are older than age_limit.
+        """
+        stats = memorized_func.stats
+        start_time = time.perf_counter()
+
+        if self.write_behind is not None:
+            pending = self.write_behind.get((str(memory.location), *call_id))
+            if pending is not None:
+                if age_limit is None or time.time() - pending[1] <= age_limit:
+                    stats.record_time("lookup", time.perf_counter() - start_time)
+                    stats.record("hits")
+                    return pending
+
+        created = None
+        found = memorized_func._is_in_cache_and_valid(call_id)
+        if found and age_limit is not None:
+            created = memory.store_backend.get_metadata(call_id).get("time", 0)
+            found = time.time() - created <= age_limit
+
+        lookup_end_time = time.perf_counter()
+        stats.record_time("lookup", lookup_end_time - start_time)
+        if not found:
+            return None
+
+        try:
+            results = memorized_func._load_item(call_id)
+        except Exception:
+            # Corrupted cache entry - to recompute (warning as joblib does)
+            warnings.warn(
+                f"Exception while loading the cached results of {call_id[0]} "
+                f"(argument hash {call_id[1]}), recomputing them:\n{traceback.format_exc()}"
+            )
+            return None
+        stats.record_time("deserialize", time.perf_counter() - lookup_end_time)
+
+        memory.size_tracker.record_access(call_id)
+        stats.record("hits")
+        # (the results of an item are stored in a single file)
+        try:
+            nbytes = os.path.getsize(
+                os.path.join(memory.size_tracker.item_path(call_id), "output.pkl")
+            )
+        except OSError:
+            nbytes = 0
+        stats.record("bytes_read", nbytes)
+
+        return results, created
+
+    def _compute(self, memory, memorized_func, call_id, args, kwargs, ttl=None, lock=None):
+        """
+        Compute the results of a joblib MemorizedFunc call and write them to the disk cache,
+        right away or in the background (write-behind).
+        Returns the results and their creation time.
+        - lock: None|LeaseLock, lock of the call, released once the results are written
+        """
+        results, duration = _timed_call(memorized_func.func, args, kwargs)
+        memorized_func.stats.record_time("compute", duration)
+
+        return self._store(memory, memorized_func, call_id, args, kwargs, results, duration, ttl, lock)
+
+    def _store(
+        self, memory, memorized_func, call_id, args, kwargs, results, duration, ttl=None, lock=None
+    ):
+        """
+        Write computed results of a joblib MemorizedFunc call to the disk cache,
+        right away or in the background (write-behind).
+        Returns the results and their creation time.
+        - lock: None|LeaseLock, lock of the call, released once the results are written
+        """
+        write = functools.partial(
+            self._write, memory, memorized_func, call_id, args, kwargs, results, duration, ttl, lock
+        )
+
+        if self.write_behind is not None:
+            created = time.time()
+            self.write_behind.submit((str(memory.location), *call_id), (results, created), write)
+            return results, created
+
+        metadata = write()
+        if memorized_func.mmap_mode is not None:
+            results = self._memmap_results(memorized_func, call_id, metadata, results)
+
+        return results, metadata.get("time")
+
+    @staticmethod
+    def _memmap_results(memorized_func, call_id, metadata, results):
+        """
+        Reload the results of a joblib MemorizedFunc call just written to the disk cache, memory-mapped,
+        to be consistent with later calls. Returns the in-memory 'results' if they cannot be reloaded
+        (e.g. evicted right away, as larger than the cache size limit).
+        """
+        try:
+            return memorized_func._load_item(call_id, metadata)
+        except Exception:
+            return results
+
+    @staticmethod
+    def _write(memory, memorized_func, call_id, args, kwargs, results, duration, ttl=None, lock=None):
+        """
+        Write the results of a joblib MemorizedFunc call to the disk cache,
+        and return their metadata.
+        - lock: None|LeaseLock, lock of the call, released once the results are written
+        """
+        start_time = time.perf_counter()
+        try:
+            store_backend = memorized_func.store_backend
+            # (compressed results cannot be memory-mapped at load time)
+            if memorized_func.auto_compression is not None and memorized_func.mmap_mode is None:
+                store_backend = compressed_store_backend(
+                    store_backend,
+                    memorized_func.auto_compression.choose(results, store_backend.location),
+                )
+            store_backend.dump_item(call_id, results, verbose=0)
+            metadata = memorized_func._persist_input(duration, call_id, args, kwargs)
+            size = memory.size_tracker.record_write(call_id, duration, ttl)
+            memorized_func.stats.record_time("write", time.perf_counter() - start_time)
+            memorized_func.stats.record("bytes_written", size)
+        finally:
+            if lock is not None:
+                lock.release()
+
+        return metadata
+
+    async def _async_call_memorized_func(
+        self, memory, memorized_func, args, kwargs,
+        again=False, memory_tier=None, ttl=None, max_age=None
+    ):
+        """
+        Asynchronous version of _call_memorized_func, for coroutine functions.
+
+        Hashing arguments, reading from and writing to the disk cache run in
+        the default executor of the event loop, so that the loop is never blocked.
+        Concurrent identical awaits are computed (or loaded) only once.
+        """
+        # Imported here rather than at the module level,
+        # to keep 'import cachecache' fast (asyncio is only needed by coroutine functions)
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        call_id = await self._run_in_executor(self._call_id, memorized_func, args, kwargs)
+
+        tier = self.memory_tier if memory_tier is not False else None
+        tier_key = self._tier_key(memorized_func, call_id)
+        age_limit = _age_limit(ttl, max_age)
+
+        if not again and tier is not None:
+            results = self._get_fresh(
+                tier, tier_key, age_limit, memorized_func.stats, memory.size_tracker
+            )
+            if results is not _MISSING:
+                return results
+
+        # Each await loads its own copy of cached results
+        if not again:
+            loaded = await self._run_in_executor(
+                self._load, memory, memorized_func, call_id, age_limit
+            )
+            if loaded is not None:
+                if tier is not None:
+                    tier.put(tier_key, loaded)
+                return loaded[0]
+
+        # Concurrent identical awaits missing results within the event loop are computed only once,
+        # and share the computed results (refreshes and awaits requiring fresher results
+        # do not join other awaits)
+        flight_key = (
+            loop, str(memory.location), *call_id, memorized_func.mmap_mode, again, age_limit, ttl
+        )
+        flight = self._async_flights.get(flight_key)
+        if flight is None:
+            flight = loop.create_task(self._async_load_or_compute(
+                memory, memorized_func, call_id, args, kwargs, again, age_limit, ttl
+            ))
+            self._async_flights[flight_key] = flight
+            flight.add_done_callback(lambda _: self._async_flights.pop(flight_key, None))
+        else:
+            # served with the results of the identical await running concurrently
+            memorized_func.stats.record("hits")
+        results, created = await asyncio.shield(flight)
+
+        if tier is not None:
+            tier.put(tier_key, (results, created))
+
+        return results
+
+    async def _async_load_or_compute(
+        self, memory, memorized_func, call_id, args, kwargs, again, age_limit, ttl
+    ):
+        "Asynchronous version of _load_or_compute, for coroutine functions."
+        import asyncio
+
+        def load(age_limit):
+            return self._run_in_executor(self._load, memory, memorized_func, call_id, age_limit)
+
+        if again:
+            # Keep joblib's function code bookkeeping up to date
+            # (it is otherwise handled by the cache lookup)
+            await self._run_in_executor(memorized_func._check_previous_func_code, 5)
+        else:
+            loaded = await load(age_limit)
+            if loaded is not None:
+                return loaded
+
+        lock = None
+        if self.lock_across_processes:
+            # Results written after this point are fresh enough, even if again is True
+            start_time = time.time()
+            lock = LeaseLock(self._lock_path(memory, call_id), self.lock_lease_duration)
+            while not await self._run_in_executor(lock.acquire):
+                await asyncio.sleep(self.lock_poll_interval)
+                loaded = await load(time.time() - start_time if again else age_limit)
+                if loaded is not None:
+                    return loaded
+
+        try:
+            if lock is not None:
+                # Results may have been written by another process
+                # between the last lookup and the lock acquisition
+                loaded = await load(time.time() - start_time if again else age_limit)
+                if loaded is not None:
+                    await self._run_in_executor(lock.release)
+                    return loaded
+
+            memorized_func.stats.record("refreshes" if again else "misses")
+            start_time = time.time()
+            results = await memorized_func.func(*args, **kwargs)
+            duration = time.time() - start_time
+            memorized_func.stats.record_time("compute", duration)
+
+            # The lock is released once the results are written
+            return await self._run_in_executor(
+                self._store, memory, memorized_func, call_id, args, kwargs,
+                results, duration, ttl, lock
+            )
+        except BaseException:
+            if lock is not None:
+                lock.release()
+            raise
+
+    def flush(self):
+        "Wait until all the results computed by the cacher are written to the disk cache."
+        if self.write_behind is not None:
+            self.write_behind.flush()
+
+    @staticmethod
+    def _lock_path(memory, call_id):
+        "Path to the lease lock file of a call, next to its cache directory."
+        return os.path.join(memory.store_backend.location, call_id[0], call_id[1] + ".lock")
+
+    def _map(
+        self, func, arguments_to_ignore, ttl, compress,
+        iterable_of_args, n_jobs=None, prefer="threads", again=False, cache_path=None,
+        mmap_mode=None
+    ):
+        """
+        Call 'func' over an iterable of arguments (see the map method of cached functions):
+        all calls are looked up in the cache in one pass, the results found are reloaded,
+        and the missing results are computed in parallel with joblib.Parallel,
+        then written to the cache.
+        Each call gets its own CallEvent, passed to the hooks of the cacher once its results are known.
+
+        Note: calls computed by map are not locked across processes.
+        """
+        from joblib import Parallel, delayed
+
+        calls = [_as_call(arguments) for arguments in iterable_of_args]
+        events = [CallEvent(func) if self.hooks else None for _ in calls]
+
+        memory = self.get_cache_memory(cache_path)
+        if memory is None:
+            stats = self._get_function_stats(func)
+            for event in events:
+                with self._recording(event):
+                    stats.record("bypasses")
+            try:
+                return Parallel(n_jobs=n_jobs, prefer=prefer)(
+                    delayed(func)(*args, **kwargs) for args, kwargs in calls
+                )
+            except BaseException as e:
+                for event in events:
+                    if event is not None:
+                        event.error = e
+                raise
+            finally:
+                for event in events:
+                    if event is not None:
+                        self._emit(event)
+        memorized_func = self._get_memorized_func(
+            func, memory, arguments_to_ignore, mmap_mode, compress
+        )
+        binder = get_signature_binder(func)
+        for event in events:
+            if event is not None:
+                event.location = str(memory.location)
+
+        # Look all calls up, in one pass
+        results = [_MISSING] * len(calls)
+        missing = OrderedDict()  # call_id -> indices of the calls
+        for i, (args, kwargs) in enumerate(calls):
+            with self._recording(events[i]):
+                start_time = time.perf_counter()
+                binder.bind(args, kwargs)
+                record_stage("bind", time.perf_counter() - start_time)
+                call_id = self._call_id(memorized_func, args, kwargs)
+                if not again and call_id not in missing:
+                    results[i] = self._lookup(memory, memorized_func, call_id, age_limit=ttl)
+                    if results[i] is not _MISSING:
+                        if events[i] is not None:
+                            self._emit(events[i])
+                        continue
+                if call_id in missing:
+                    # served with the results of the identical call computed below
+                    memorized_func.stats.record("hits")
+                else:
+                    memorized_func.stats.record("refreshes" if again else "misses")
+            missing.setdefault(call_id, []).append(i)
+
+        try:
+            # Compute missing results (identical calls only once), in parallel
+            computed = Parallel(n_jobs=n_jobs, prefer=prefer)(
+                delayed(_timed_call)(func, *calls[indices[0]])
+                for indices in missing.values()
+            )
+
+            # Write them to the cache
+            for (call_id, indices), (call_results, duration) in zip(missing.items(), computed):
+                with self._recording(events[indices[0]]):
+                    memorized_func.stats.record_time("compute", duration)
+                    args, kwargs = calls[indices[0]]
+                    write = functools.partial(
+                        self._write, memory, memorized_func, call_id, args, kwargs,
+                        call_results, duration, ttl
+                    )
+                    created = time.time()
+                    if self.write_behind is not None:
+                        self.write_behind.submit(
+                            (str(memory.location), *call_id), (call_results, created), write
+                        )
+                    else:
+                        metadata = write()
+                        created = metadata.get("time", created)
+                        if mmap_mode is not None:
+                            call_results = self._memmap_results(
+                                memorized_func, call_id, metadata, call_results
+                            )
+                    if self.memory_tier is not None:
+                        self.memory_tier.put(
+                            self._tier_key(memorized_func, call_id), (call_results, created)
+                        )
+                for i in indices:
+                    results[i] = call_results
+        except BaseException as e:
+            for indices in missing.values():
+                for i in indices:
+                    if events[i] is not None and events[i].error is None:
+                        events[i].error = e
+            raise
+        finally:
+            for indices in missing.values():
+                for i in indices:
+                    if events[i] is not None:
+                        self._emit(events[i])
+
+        return results
+
+    def clear_expired(
+        self, max_age: Union[float, None] = None, cache_path: Union[str, Path, None] = None
+    ):
+        """
+        Remove the cached results whose time to live (ttl) has passed
+        from the cache at 'cache_path' (the global cache of the cacher if None).
+
+        Arguments:
+            - max_age: None|float, if not None, also remove all cached results
+                       older than max_age seconds
+            - cache_path: None|str, path to the cache directory
+
+        Returns:
+            - n_removed: int, number of removed cached results
+        """
+        memory = self.get_cache_memory(cache_path)
+        if memory is None:
+            return 0
+
+        # results not written yet are written first, to be cleared if expired
+        # (rather than served from memory, then written after the clearing)
+        if self.write_behind is not None:
+            self.write_behind.flush()
+        expired_call_ids = memory.size_tracker.clear_expired(max_age)
+        if self.memory_tier is not None:
+            expired_call_ids = set(expired_call_ids)
+            location = str(memory.store_backend.location)
+            self.memory_tier.pop_where(
+                lambda key: key[1] == location and key[3:] in expired_call_ids
+            )
+
+        return len(expired_call_ids)
+
     def instanciate_joblib_cache(
         self,
         path: int,
@@ -262,8 +2005,20 @@ class Cacher:
 
         path.mkdir(exist_ok=True)
 
+        # Imported here rather than at the module level,
+        # to keep 'import cachecache' fast
+        from joblib import Memory
+        import psutil
+
+        # Results compressed with zstd (by this or another process) can only be loaded
+        # once zstd is registered with joblib, else they are silently recomputed
+        try:
+            register_zstd()
+        except ImportError:
+            pass
+
         # Instanciate joblib memory object
-        memory = Memory(path, verbose=0)
+        memory = Memory(path, mmap_mode=self.mmap_mode, verbose=0)
 
         # Limit cache size
         free_memory_bytes = psutil.disk_usage(str(path)).free
@@ -280,14 +2035,33 @@ class Cacher:
                 )
             )
 
+        # Index of cached items (sizes, access times, hits...)
+        memory.index = None
+        if self.use_index:
+            from cachecache.index import CacheIndex
+            try:
+                memory.index = CacheIndex(memory.store_backend)
+            except CacheIndex.Error as e:
+                warnings.warn(
+                    f"Could not open the index of the cache at {str(path)} ({e}) - "
+                    "the cache directory will be walked to enforce the cache size limit."
+                )
+
+        # Cache size limit enforced at every write (rather than walking the whole cache now)
         memory.caching_memory_allocation = caching_memory_allocation
-        memory.reduce_size(bytes_limit=caching_memory_allocation)
+        memory.size_tracker = CacheSizeTracker(
+            memory.store_backend,
+            caching_memory_allocation,
+            index=memory.index,
+            eviction_policy=self.eviction_policy,
+        )
 
         return memory
 
 
-# cachecache default global cache
-cache = Cacher(default_cache_path)
+# cachecache default global cache,
+# opened at first use rather than when cachecache is imported
+cache = Cacher(default_cache_path, lazy=True)
 
 
 def distributed_cacher(
@@ -343,31 +2117,83 @@ def distributed_cacher(
     def decorator(func):
         "Simple nested wrapper allowing to pass arguments to @distributed_cacher."
 
-        @functools.wraps(func)
-        def locally_cached_func(*args, **kwargs):
+        # Wrap the function once, at decoration time
+        cached_func = global_cache(func)  # same as decorating func with @cache
+
+        # Locate the datapath argument once, at decoration time
+        binder = get_signature_binder(func)
+        if datapath_arg_name in binder.positional_names:
+            datapath_arg_index = binder.positional_names.index(datapath_arg_name)
+        else:
+            datapath_arg_index = None
+        datapath_default = binder.defaults.get(datapath_arg_name)
+
+        # f'{datapath_arg_name}/{local_cache_path}' for each datapath
+        # (the local caches themselves are kept open by the memory pool of global_cache)
+        @functools.lru_cache(maxsize=1024)
+        def get_local_cache_path(datapath):
+            return Path(datapath) / local_cache_path
+
+        def get_cache_path(args, kwargs):
+            "Local cache path of a call, if its datapath is a sensible path (else None)."
+            if datapath_arg_name in kwargs:
+                datapath = kwargs[datapath_arg_name]
+            elif datapath_arg_index is not None and datapath_arg_index < len(args):
+                datapath = args[datapath_arg_index]
+            else:
+                datapath = datapath_default
 
-            arg_kwargs = make_arg_kwargs_dic(func, args, kwargs)
+            if isinstance(datapath, (str, Path)):
+                return get_local_cache_path(datapath)
+            return None
 
+        def set_cache_path(args, kwargs):
             # replace the cache_path argument
             # with f'{datapath_arg_name}/{local_cache_path}'
-            if datapath_arg_name in arg_kwargs:
-                datapath = arg_kwargs[datapath_arg_name]
-                # if passed datapath is a sensible path
-                if isinstance(datapath, (str, Path)):
-                    new_cache_path = Path(datapath) / local_cache_path
-                    # if 'cache_path' also passed to function,
-                    # cache_path still prevails.
-                    if "cache_path" in kwargs:
-                        if kwargs["cache_path"] is None:
-                            kwargs["cache_path"] = new_cache_path
-                    else:
-                        kwargs["cache_path"] = new_cache_path
+            # if passed datapath is a sensible path
+            # (if 'cache_path' also passed to function, cache_path still prevails)
+            if kwargs.get("cache_path") is None:
+                datapath_cache_path = get_cache_path(args, kwargs)
+                if datapath_cache_path is not None:
+                    kwargs["cache_path"] = datapath_cache_path
 
-            cached_func = global_cache(func)  # same as decorating func with @cache
-            results = cached_func(*args, **kwargs)
+        @functools.wraps(func)
+        def locally_cached_func(*args, **kwargs):
+            set_cache_path(args, kwargs)
+            return cached_func(*args, **kwargs)
+
+        def submit(*args, **kwargs):
+            "Submit a call to the cached function (see Cacher), cached in the local cache of its datapath."
+            set_cache_path(args, kwargs)
+            return cached_func.submit(*args, **kwargs)
+
+        def map(iterable_of_args, cache_path=None, **map_kwargs):
+            """
+            Call the cached function over an iterable of arguments (see Cacher),
+            each call cached in the local cache of its datapath
+            (calls are grouped by local cache, and each group mapped at once).
+            """
+            if cache_path is not None:
+                return cached_func.map(iterable_of_args, cache_path=cache_path, **map_kwargs)
+
+            groups = OrderedDict()  # local cache path -> indices and arguments of its calls
+            for i, arguments in enumerate(iterable_of_args):
+                group = groups.setdefault(get_cache_path(*_as_call(arguments)), ([], []))
+                group[0].append(i)
+                group[1].append(arguments)
+
+            results = [None] * sum(len(indices) for indices, _ in groups.values())
+            for group_cache_path, (indices, group_args) in groups.items():
+                group_results = cached_func.map(group_args, cache_path=group_cache_path, **map_kwargs)
+                for i, call_results in zip(indices, group_results):
+                    results[i] = call_results
 
             return results
 
+        locally_cached_func.submit = submit
+        locally_cached_func.map = map
+        locally_cached_func.cache_stats = cached_func.cache_stats
+
         return locally_cached_func
 
     return decorator
@@ -0,0 +1,315 @@
+import copy
+import functools
+import io
+import os
+import threading
+import time
+import weakref
+
+# Compression codecs of cached results
+# (zstd is registered with joblib when a cache is opened, if zstandard is installed)
+CODECS = ("zlib", "gzip", "bz2", "lzma", "xz", "lz4", "zstd")
+
+# Compression settings compared by AutoCompression (codecs fast enough to decompress
+# to possibly speed up loading), skipped if their library is not installed
+AUTO_CANDIDATES = (False, ("zlib", 1), ("zlib", 3), ("lz4", 1), ("zstd", 1), ("zstd", 3))
+
+# Read bandwidth assumed if it cannot be measured, in bytes per second
+DEFAULT_READ_BANDWIDTH = 500e6
+
+ZSTD_PREFIX = b"\x28\xb5\x2f\xfd"  # magic number of zstd frames
+
+_zstd_lock = threading.Lock()
+_read_bandwidths = {}  # cache location -> measured read bandwidth
+_compressed_store_backends = weakref.WeakKeyDictionary()  # store backend -> {compress: copy}
+
+
+class ZstdFile(io.RawIOBase):
+    """
+    File object compressing to (mode "wb") or decompressing from (mode "rb")
+    a zstd stream written to or read from 'fileobj' (which is left open when closed).
+    """
+
+    def __init__(self, fileobj, mode: str = "rb", compresslevel=None):
+        import zstandard
+
+        self.mode = mode
+        if mode.startswith("r"):
+            self._stream = zstandard.ZstdDecompressor().stream_reader(fileobj, closefd=False)
+        else:
+            self._stream = zstandard.ZstdCompressor(
+                level=3 if compresslevel is None else compresslevel
+            ).stream_writer(fileobj, closefd=False, write_return_read=True)
+
+    def readable(self):
+        return self.mode.startswith("r")
+
+    def writable(self):
+        return not self.readable()
+
+    def readinto(self, buffer):
+        return self._stream.readinto(buffer)
+
+    def write(self, data):
+        return self._stream.write(data)
+
+    def close(self):
+        if not self.closed:
+            # ends the zstd frame
+            self._stream.close()
+        super().close()
+
+
+def register_zstd():
+    "Register the zstd codec with joblib (requires the zstandard package)."
+    import zstandard  # noqa: F401 - raises ImportError if not installed
+    from joblib.compressor import _COMPRESSORS, CompressorWrapper, register_compressor
+
+    with _zstd_lock:
+        if "zstd" not in _COMPRESSORS:
+            register_compressor(
+                "zstd", CompressorWrapper(obj=ZstdFile, prefix=ZSTD_PREFIX, extension=".zst")
+            )
+
+
+def check_compress(compress):
+    """
+    Validate the compression of cached results and return it, as one of:
+        - False: no compression (also for None and 0),
+        - True: zlib at level 3,
+        - int: zlib at this level (1 to 9),
+        - str: codec (one of CODECS) at its default level,
+        - (str, int): codec and level,
+        - "auto": codec picked for each function (see AutoCompression).
+    Raises ValueError if the codec or level is not valid, or if the library of the codec is not installed.
+    """
+    if compress is None or compress is False or compress == 0:
+        return False
+    if compress is True or compress == "auto":
+        return compress
+
+    if isinstance(compress, int):
+        codec, level = "zlib", compress
+    elif isinstance(compress, str):
+        codec, level = compress, None
+    elif isinstance(compress, (tuple, list)) and len(compress) == 2:
+        codec, level = compress
+        compress = tuple(compress)
+    else:
+        raise ValueError(
+            f"compress must be a bool, a level, a codec or a (codec, level) tuple, not '{compress}'."
+        )
+
+    if codec not in CODECS:
+        raise ValueError(f"compression codec must be one of {CODECS}, not '{codec}'.")
+    if level is not None and level not in range(10):
+        raise ValueError(f"compression level must be an integer from 0 to 9, not '{level}'.")
+    try:
+        if codec == "lz4":
+            import lz4.frame  # noqa: F401
+        elif codec == "zstd":
+            register_zstd()
+    except ImportError:
+        package = {"lz4": "lz4", "zstd": "zstandard"}[codec]
+        raise ValueError(f"compression codec '{codec}' requires the '{package}' package.")
+
+    return compress
+
+
+def is_available(compress) -> bool:
+    "Whether the library of the codec of 'compress' is installed."
+    try:
+        check_compress(compress)
+    except ValueError:
+        return False
+
+    return True
+
+
+def compressed_store_backend(store_backend, compress):
+    """
+    joblib store backend writing items compressed with 'compress'
+    (a copy of 'store_backend', at the same location, unless it already does).
+    """
+    if compress == store_backend.compress:
+        return store_backend
+
+    copies = _compressed_store_backends.setdefault(store_backend, {})
+    if compress not in copies:
+        compressed = copy.copy(store_backend)
+        compressed.compress = compress
+        copies[compress] = compressed
+
+    return copies[compress]
+
+
+def measure_read_bandwidth(path, nbytes: int = 2**24) -> float:
+    """
+    Read bandwidth of the disk holding directory 'path', in bytes per second
+    (measured once per directory, reading a file of 'nbytes' bytes dropped from the page cache).
+    Returns DEFAULT_READ_BANDWIDTH if it cannot be measured.
+    """
+    path = str(path)
+    if path in _read_bandwidths:
+        return _read_bandwidths[path]
+
+    bandwidth = DEFAULT_READ_BANDWIDTH
+    test_file = None
+    try:
+        import tempfile
+
+        fd, test_file = tempfile.mkstemp(prefix=".cachecache_bandwidth_", dir=path)
+        with os.fdopen(fd, "wb") as f:
+            f.write(os.urandom(nbytes))
+            f.flush()
+            os.fsync(f.fileno())
+        with open(test_file, "rb", buffering=0) as f:
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+            start_time = time.perf_counter()
+            while f.read(2**20):
+                pass
+            bandwidth = nbytes / max(time.perf_counter() - start_time, 1e-6)
+    except OSError:
+        pass
+    finally:
+        if test_file is not None:
+            try:
+                os.remove(test_file)
+            except OSError:
+                pass
+
+    _read_bandwidths[path] = bandwidth
+
+    return bandwidth
+
+
+class _SampleWriter:
+    "Write-only file object keeping the first 'max_bytes' bytes written to it, counting all of them."
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._buffer = bytearray()
+
+    def write(self, data):
+        data = memoryview(data).cast("B")
+        self.nbytes += data.nbytes
+        missing = self.max_bytes - len(self._buffer)
+        if missing > 0:
+            self._buffer += data[:missing]
+
+        return data.nbytes
+
+    def tell(self) -> int:
+        return self.nbytes
+
+    def getvalue(self) -> bytes:
+        return bytes(self._buffer)
+
+
+def _codec_functions(compress):
+    "compress(data) and decompress(data) functions of the codec of 'compress' (not False)."
+    codec, level = compress
+    if codec in ("zlib", "gzip"):
+        import zlib
+        return functools.partial(zlib.compress, level=level), zlib.decompress
+    if codec == "bz2":
+        import bz2
+        return functools.partial(bz2.compress, compresslevel=level), bz2.decompress
+    if codec in ("lzma", "xz"):
+        import lzma
+        return functools.partial(lzma.compress, preset=level), lzma.decompress
+    if codec == "lz4":
+        import lz4.frame
+        return functools.partial(lz4.frame.compress, compression_level=level), lz4.frame.decompress
+    if codec == "zstd":
+        import zstandard
+        return zstandard.ZstdCompressor(level=level).compress, zstandard.ZstdDecompressor().decompress
+
+    raise ValueError(f"compression codec must be one of {CODECS}, not '{codec}'.")
+
+
+class AutoCompression:
+    """
+    Compression of the results of a cached function, picking the codec
+    that minimizes their expected load latency.
+
+    The first 'n_samples' results are pickled (keeping up to 'sample_bytes' bytes of each)
+    and compressed with each of the candidate codecs (AUTO_CANDIDATES, if installed).
+    The expected load latency of a codec is the time taken to read the compressed results
+    from the disk, at 'read_bandwidth', plus the time taken to decompress them.
+    Results are written with the codec of lowest expected load latency sampled so far,
+    and for good once 'n_samples' results were sampled.
+
+    Arguments:
+        - n_samples: int, number of results sampled before the codec is settled
+        - sample_bytes: int, maximum number of bytes of pickled results compressed by each codec
+        - read_bandwidth: None|float, read bandwidth of the disk holding the cache, in bytes per second
+                          (if None, measured at the first sample, see measure_read_bandwidth)
+    """
+
+    def __init__(self, n_samples: int = 3, sample_bytes: int = 2**25, read_bandwidth=None):
+        self.n_samples = n_samples
+        self.sample_bytes = sample_bytes
+        self.read_bandwidth = read_bandwidth
+        self.candidates = [candidate for candidate in AUTO_CANDIDATES if is_available(candidate)]
+        self.compress = False
+        self.n_sampled = 0
+        # candidate -> [expected compressed bytes, expected decompression time in seconds]
+        self._expected = {candidate: [0.0, 0.0] for candidate in self.candidates}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"AutoCompression({self.compress}, {self.n_sampled}/{self.n_samples} samples)"
+
+    def choose(self, results, location=None):
+        """
+        Compression to write 'results' with, sampling them if fewer than n_samples results were.
+        - location: None|str, directory of the cache (to measure its read bandwidth)
+        """
+        if self.n_sampled >= self.n_samples:
+            return self.compress
+
+        with self._lock:
+            if self.n_sampled < self.n_samples:
+                if self.read_bandwidth is None:
+                    self.read_bandwidth = (
+                        DEFAULT_READ_BANDWIDTH if location is None
+                        else measure_read_bandwidth(location)
+                    )
+                self._sample(results)
+                self.n_sampled += 1
+                latencies = self.expected_load_latencies()
+                self.compress = min(self.candidates, key=latencies.get)
+
+        return self.compress
+
+    def expected_load_latencies(self):
+        "Expected time taken to load the sampled results, for each candidate compression, in seconds."
+        return {
+            candidate: nbytes / self.read_bandwidth + decompression_time
+            for candidate, (nbytes, decompression_time) in self._expected.items()
+        }
+
+    def _sample(self, results):
+        "Compress the pickled 'results' with each candidate codec."
+        from joblib import numpy_pickle
+
+        sample = _SampleWriter(self.sample_bytes)
+        numpy_pickle.dump(results, sample)
+        data = sample.getvalue()
+        # the costs measured on the sample are scaled to the whole pickled results
+        scale = sample.nbytes / max(len(data), 1)
+
+        for candidate in self.candidates:
+            if candidate is False:
+                self._expected[candidate][0] += sample.nbytes
+                continue
+            compress, decompress = _codec_functions(candidate)
+            compressed = compress(data)
+            start_time = time.perf_counter()
+            decompress(compressed)
+            decompression_time = time.perf_counter() - start_time
+            self._expected[candidate][0] += len(compressed) * scale
+            self._expected[candidate][1] += decompression_time * scale
@@ -0,0 +1,263 @@
+import functools
+import hashlib
+import os
+import sys
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+# Size of the chunks of buffers hashed separately by tree_digest, in bytes
+# (fixed, so that digests do not depend on the number of threads hashing them)
+CHUNK_BYTES = 2**24
+
+# Sentinel for objects without a declared version
+_MISSING = object()
+
+# Hash memos, whose thread pools are dropped in child processes created by os.fork()
+_hash_memos = weakref.WeakSet()
+
+
+def _reset_hash_memo_executors():
+    "Drop the thread pools of the hash memos (inherited without their threads by forked child processes)."
+    for hash_memo in list(_hash_memos):
+        hash_memo._executor = None
+        hash_memo._lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_hash_memo_executors)
+
+
+class ArgumentDigest:
+    """
+    Stand-in for a large argument in the arguments hashed into the args_id of a call:
+    the digest of its content (see HashMemo), hashed in its place.
+
+    Arguments:
+        - kind: str, "ndarray" for numpy arrays, "object" for objects with a declared version
+        - digest: str, hexadecimal digest of the content of the argument
+    """
+
+    __slots__ = ("kind", "digest")
+
+    def __init__(self, kind: str, digest: str):
+        self.kind = kind
+        self.digest = digest
+
+    def __repr__(self):
+        return f"ArgumentDigest({self.kind}, {self.digest})"
+
+    def __reduce__(self):
+        return ArgumentDigest, (self.kind, self.digest)
+
+
+def _leaf_digest(chunk) -> bytes:
+    "Digest of a chunk of a buffer (leaf of the tree of tree_digest)."
+    return hashlib.blake2b(chunk, digest_size=32, person=b"cachecache.leaf").digest()
+
+
+def tree_digest(data, header: bytes = b"", executor=None) -> str:
+    """
+    Hexadecimal digest of a contiguous buffer 'data' (and of 'header'), as a tree of depth 2:
+    chunks of CHUNK_BYTES bytes are hashed separately (leaves), in the threads of 'executor'
+    if given (hashlib releases the GIL while hashing), then their digests are hashed together (root).
+    The digest only depends on 'header' and on the data, not on the number of threads.
+    """
+    view = memoryview(data).cast("B")
+    chunks = [view[start:start + CHUNK_BYTES] for start in range(0, view.nbytes, CHUNK_BYTES)]
+    if executor is None or len(chunks) < 2:
+        leaves = map(_leaf_digest, chunks)
+    else:
+        leaves = executor.map(_leaf_digest, chunks)
+
+    root = hashlib.blake2b(header, digest_size=16, person=b"cachecache.root")
+    root.update(b"|%d|" % view.nbytes)
+    for leaf in leaves:
+        root.update(leaf)
+
+    return root.hexdigest()
+
+
+def array_digest(array, executor=None) -> str:
+    """
+    Hexadecimal digest of a numpy array (without Python objects): of its class, dtype, shape,
+    memory order and data (see tree_digest, hashing chunks of the data in the threads of 'executor' if given).
+    Fortran-ordered arrays are hashed without copy, other non C-contiguous arrays are copied to C order first.
+    """
+    import numpy as np
+
+    if array.flags.c_contiguous:
+        order, data = "C", array
+    elif array.flags.f_contiguous:
+        order, data = "F", array.T
+    else:
+        order, data = "C", np.ascontiguousarray(array)
+
+    # memory-mapped arrays hash like the arrays they hold
+    array_class = np.ndarray if isinstance(array, np.memmap) else type(array)
+    header = f"{array_class.__module__}.{array_class.__qualname__}|{array.dtype.descr}|{array.shape}|{order}|"
+
+    return tree_digest(data.reshape(-1).view(np.uint8), header.encode(), executor)
+
+
+def is_frozen(array) -> bool:
+    """
+    Whether the data of a numpy array cannot be modified: the array and all the arrays
+    it is a view of are read-only, and the memory they view is owned by one of them
+    or by an immutable bytes object.
+    """
+    import numpy as np
+
+    obj = array
+    while isinstance(obj, np.ndarray):
+        if obj.flags.writeable:
+            return False
+        obj = obj.base
+
+    return obj is None or type(obj) is bytes
+
+
+def _discard(digests, key, _ref):
+    "Weak reference callback, forgetting the entry of a deleted object."
+    digests.pop(key, None)
+
+
+class HashMemo:
+    """
+    Memo of the digests of large arguments, keyed by object identity,
+    so that an argument passed repeatedly (to one or several cached functions)
+    is hashed once for as long as it is alive and unchanged.
+
+    Before hashing the arguments of a call, numpy arrays of at least 'min_bytes' bytes,
+    and objects with a declared version (see declare_version), are replaced by their ArgumentDigest.
+    The digest of an argument is reused in later calls only if the argument is known not to have changed:
+        - numpy arrays that are frozen (see is_frozen): read-only, and views of read-only memory only,
+        - objects with a declared version, as long as their version is the same.
+    Other large arrays are hashed again at every call.
+
+    Arrays are hashed in chunks across 'n_threads' threads (see tree_digest).
+
+    Note: only arguments passed directly are replaced (not arrays within lists, dicts... of arguments).
+    Frozen arrays must not be made writeable again (array.flags.writeable = True) and modified.
+
+    Arguments:
+        - min_bytes: int, size from which numpy arrays are replaced by their digest, in bytes
+        - n_threads: int, number of threads hashing the chunks of large arrays
+        - memoize: bool, whether to reuse the digests of unchanged arguments
+                   (if False, arguments are hashed into their digest at every call)
+    """
+
+    def __init__(self, min_bytes: int = 2**20, n_threads: int = 1, memoize: bool = True):
+        self.min_bytes = min_bytes
+        self.n_threads = n_threads
+        self.memoize = memoize
+        self._executor = None
+        self._digests = {}  # id(obj) -> (weak reference to obj, marker of unchanged content, ArgumentDigest)
+        self._versions = {}  # id(obj) -> (weak reference to obj, version)
+        self._lock = threading.Lock()
+        _hash_memos.add(self)
+
+    def __repr__(self):
+        return f"HashMemo({len(self._digests)} digests, {len(self._versions)} declared versions)"
+
+    def __len__(self):
+        return len(self._digests)
+
+    @property
+    def executor(self):
+        """
+        Thread pool hashing the chunks of large arrays (None if n_threads is 1), created at first use
+        (and created again in child processes created by os.fork()).
+        """
+        if self.n_threads <= 1:
+            return None
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        self.n_threads, thread_name_prefix="cachecache_hash"
+                    )
+
+        return self._executor
+
+    def declare_version(self, obj, version):
+        """
+        Declare the version of 'obj' (any hashable value): its digest is reused
+        as long as its declared version is the same, so the version must be changed
+        whenever obj is modified. obj must support weak references.
+        """
+        key = id(obj)
+        with self._lock:
+            self._versions[key] = (
+                weakref.ref(obj, functools.partial(_discard, self._versions, key)), version
+            )
+
+    def get_version(self, obj):
+        "Declared version of 'obj' (_MISSING if none)."
+        entry = self._versions.get(id(obj))
+        if entry is None or entry[0]() is not obj:
+            return _MISSING
+
+        return entry[1]
+
+    def digest(self, obj):
+        "ArgumentDigest of 'obj', or None if it is hashed as is (small arrays, other objects)."
+        version = self.get_version(obj)
+        numpy = sys.modules.get("numpy")
+        is_array = (
+            numpy is not None
+            and isinstance(obj, numpy.ndarray)
+            and not obj.dtype.hasobject
+            and obj.nbytes >= self.min_bytes
+        )
+        if not is_array and version is _MISSING:
+            return None
+
+        if not self.memoize:
+            marker = None
+        elif version is not _MISSING:
+            marker = ("version", version)
+        else:
+            marker = ("frozen",) if is_frozen(obj) else None
+
+        key = id(obj)
+        entry = self._digests.get(key)
+        if marker is not None and entry is not None and entry[0]() is obj and entry[1] == marker:
+            return entry[2]
+
+        if is_array:
+            digest = ArgumentDigest("ndarray", array_digest(obj, self.executor))
+        else:
+            from joblib import hashing
+            digest = ArgumentDigest("object", hashing.hash(obj))
+
+        if marker is not None:
+            with self._lock:
+                self._digests[key] = (
+                    weakref.ref(obj, functools.partial(_discard, self._digests, key)), marker, digest
+                )
+
+        return digest
+
+    def substitute(self, args, kwargs):
+        "Arguments of a call, with large arguments replaced by their ArgumentDigest."
+        substituted_args = None
+        for i, arg in enumerate(args):
+            digest = self.digest(arg)
+            if digest is not None:
+                if substituted_args is None:
+                    substituted_args = list(args)
+                substituted_args[i] = digest
+
+        substituted_kwargs = None
+        for name, arg in kwargs.items():
+            digest = self.digest(arg)
+            if digest is not None:
+                if substituted_kwargs is None:
+                    substituted_kwargs = dict(kwargs)
+                substituted_kwargs[name] = digest
+
+        return (
+            args if substituted_args is None else tuple(substituted_args),
+            kwargs if substituted_kwargs is None else substituted_kwargs,
+        )
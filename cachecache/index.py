@@ -0,0 +1,360 @@
+import atexit
+import contextlib
+import os
+import sqlite3
+import threading
+import time
+import weakref
+
+from cachecache.size_tracker import get_item_size
+from cachecache.utils import is_network_filesystem
+
+INDEX_FILENAME = ".cachecache_index.sqlite"
+
+# Max time waiting for the lock of an index written by another process, in seconds
+# (the index is bookkeeping: failing fast and falling back to walking the cache directory
+# beats stalling calls)
+BUSY_TIMEOUT = 2.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    func_id TEXT NOT NULL,
+    args_id TEXT NOT NULL,
+    size INTEGER NOT NULL DEFAULT 0,
+    created REAL NOT NULL,
+    last_access REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    duration REAL,
+    priority REAL NOT NULL DEFAULT 0,
+    expires REAL,
+    PRIMARY KEY (func_id, args_id)
+);
+CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access);
+CREATE INDEX IF NOT EXISTS entries_priority ON entries (priority);
+CREATE INDEX IF NOT EXISTS entries_expires ON entries (expires);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value
+);
+"""
+
+# Inflation of the cache (see CacheIndex), read from the index within the queries updating priorities,
+# so that priorities account for the evictions of all the processes sharing the cache
+_INFLATION = "COALESCE((SELECT value FROM meta WHERE key = 'inflation'), 0.0)"
+
+# Running total of the sizes of the items of the cache, updated in the transactions
+# inserting and deleting items (so that sizing the cache does not sum the sizes of all its items)
+_ADD_TO_TOTAL_SIZE = "UPDATE meta SET value = value + ? WHERE key = 'total_size'"
+
+# Indices with pending hits to write when the interpreter exits
+_open_indices = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_open_indices():
+    for index in list(_open_indices):
+        try:
+            index.flush()
+        except sqlite3.Error:
+            pass
+
+
+class CacheIndex:
+    """
+    SQLite index of the items of a joblib cache.
+
+    Stores, for each cached item: the function and argument hashes identifying it (func_id, args_id),
+    its size in bytes, its creation, last access and expiration times, its number of hits,
+    the duration of the computation of its results and its GreedyDual-Size priority.
+    Sizing, listing and evicting items then query the index rather than walking the cache directory.
+    The size of the cache is kept as a running total, updated along with the items.
+
+    GreedyDual-Size priority: an item's priority is set to L + duration / size
+    when it is written or hit, where L (the 'inflation' of the cache) is the highest priority
+    of the items evicted so far (by any process). Evicting the items of lowest priority first
+    favours items saving the most computation time per byte, and ages items that are not used.
+
+    The index lives in the cache directory ('.cachecache_index.sqlite'). On local filesystems,
+    it is in WAL mode so that processes can read it while another one writes. On network filesystems
+    (e.g. NFS, where SQLite WAL mode does not work across machines), it is in the default
+    rollback journal mode. Hits are written in batches, every 'hits_flush_interval' seconds
+    (and when the interpreter exits).
+
+    The first time a cache is indexed, its directory is walked once to index the existing items.
+
+    Queries waiting more than 'busy_timeout' seconds for the lock of the index raise CacheIndex.Error
+    (sqlite3.Error), like any other failure of the index.
+
+    Arguments:
+        - store_backend: joblib store backend of the cache (Memory.store_backend)
+        - hits_flush_interval: float, max delay before hits are written to the index, in seconds
+        - busy_timeout: float, max time waiting for the lock of the index, in seconds
+    """
+
+    # Raised by the methods of the index when SQLite fails (locked, corrupted or unreadable index...)
+    Error = sqlite3.Error
+
+    def __init__(
+        self, store_backend, hits_flush_interval: float = 1.0, busy_timeout: float = BUSY_TIMEOUT
+    ):
+        self.store_backend = store_backend
+        self.path = os.path.join(store_backend.location, INDEX_FILENAME)
+        self.hits_flush_interval = hits_flush_interval
+
+        self._lock = threading.RLock()
+        self._pending_hits = {}  # (func_id, args_id) -> [n_hits, last_access]
+        self._last_hits_flush = time.time()
+
+        self.journal_mode = "DELETE" if is_network_filesystem(store_backend.location) else "WAL"
+        self._connection = sqlite3.connect(
+            self.path, timeout=busy_timeout, check_same_thread=False, isolation_level=None
+        )
+        try:
+            self._connection.execute(f"PRAGMA journal_mode={self.journal_mode}")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.executescript(_SCHEMA)
+            if self._get_meta("indexed") is None:
+                self.reindex()
+            elif self._get_meta("total_size") is None:
+                # indexed before the running total was kept
+                with self._transaction():
+                    self._set_meta("total_size", self._sum_sizes())
+        except sqlite3.Error:
+            self._connection.close()
+            raise
+
+        _open_indices.add(self)
+
+    def __repr__(self):
+        return f"CacheIndex({self.path})"
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    @property
+    def inflation(self) -> float:
+        "Inflation of the cache: highest priority of the items evicted so far, by any process."
+        with self._lock:
+            return self._get_meta("inflation") or 0.0
+
+    def _get_meta(self, key):
+        row = self._connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return None if row is None else row[0]
+
+    def _set_meta(self, key, value):
+        self._connection.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value)
+        )
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        "Context in which queries run in a single write transaction (holding the lock of the index)."
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+            self._connection.execute("COMMIT")
+
+    def _sum_sizes(self) -> int:
+        "Sum of the sizes of the items of the index, in bytes."
+        return self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def reindex(self):
+        "Rebuild the index from the items found in the cache directory."
+        rows = []
+        for item in self.store_backend.get_items():
+            func_id, args_id = self.call_id(item.path)
+            last_access = item.last_access.timestamp()
+            try:
+                created = os.path.getmtime(os.path.join(item.path, "output.pkl"))
+            except OSError:
+                created = last_access
+            duration = self.store_backend.get_metadata((func_id, args_id)).get("duration")
+            rows.append((func_id, args_id, item.size, created, last_access, duration))
+
+        with self._transaction():
+            self._connection.execute("DELETE FROM entries")
+            inflation = self._get_meta("inflation") or 0.0
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO entries "
+                "(func_id, args_id, size, created, last_access, duration, priority) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(*row, inflation + self.cost(row[5], row[2])) for row in rows],
+            )
+            self._set_meta("total_size", self._sum_sizes())
+            self._set_meta("indexed", time.time())
+
+    def item_path(self, call_id) -> str:
+        "Path to the directory of the cached item 'call_id'."
+        return os.path.join(self.store_backend.location, *call_id)
+
+    def call_id(self, item_path: str):
+        "(func_id, args_id) of the cached item at 'item_path'."
+        func_path, args_id = os.path.split(item_path)
+        return os.path.relpath(func_path, self.store_backend.location), args_id
+
+    @staticmethod
+    def cost(duration, size) -> float:
+        "Computation time saved per byte by an item of 'size' bytes, computed in 'duration' seconds."
+        return (duration or 0.0) / max(size, 1)
+
+    def priority(self, duration, size) -> float:
+        "GreedyDual-Size priority of an item of 'size' bytes, computed in 'duration' seconds."
+        return self.inflation + self.cost(duration, size)
+
+    def record_write(self, call_id, duration=None, ttl=None):
+        """
+        Index the cached item 'call_id' just written,
+        and return its size and the size it adds to the cache, in bytes.
+        - duration: float, time taken to compute the item in seconds
+        - ttl: None|float, time to live of the item in seconds
+        """
+        size = get_item_size(self.item_path(call_id))
+        now = time.time()
+        with self._transaction():
+            self._pending_hits.pop(tuple(call_id), None)
+            row = self._connection.execute(
+                "SELECT size FROM entries WHERE func_id = ? AND args_id = ?", call_id
+            ).fetchone()
+            self._connection.execute(
+                "INSERT OR REPLACE INTO entries "
+                "(func_id, args_id, size, created, last_access, hits, duration, priority, expires) "
+                f"VALUES (?, ?, ?, ?, ?, 0, ?, {_INFLATION} + ?, ?)",
+                (*call_id, size, now, now, duration, self.cost(duration, size),
+                 None if ttl is None else now + ttl),
+            )
+            added_size = size - (0 if row is None else row[0])
+            self._connection.execute(_ADD_TO_TOTAL_SIZE, (added_size,))
+
+        return size, added_size
+
+    def record_hit(self, call_id):
+        "Account for a hit of the cached item 'call_id' (written to the index in batches)."
+        now = time.time()
+        with self._lock:
+            hits = self._pending_hits.setdefault(tuple(call_id), [0, now])
+            hits[0] += 1
+            hits[1] = now
+            if now - self._last_hits_flush > self.hits_flush_interval:
+                self.flush()
+
+    def flush(self):
+        "Write pending hits to the index."
+        with self._lock:
+            pending_hits, self._pending_hits = self._pending_hits, {}
+            self._last_hits_flush = time.time()
+            if pending_hits:
+                self._connection.executemany(
+                    "UPDATE entries SET hits = hits + ?, last_access = MAX(last_access, ?), "
+                    f"priority = {_INFLATION} + COALESCE(duration, 0) / MAX(size, 1) "
+                    "WHERE func_id = ? AND args_id = ?",
+                    [(n_hits, last_access, *call_id)
+                     for call_id, (n_hits, last_access) in pending_hits.items()],
+                )
+
+    def remove(self, call_ids):
+        "Remove the cached items 'call_ids' from the index."
+        call_ids = [tuple(call_id) for call_id in call_ids]
+        with self._transaction():
+            for call_id in call_ids:
+                self._pending_hits.pop(call_id, None)
+            self._connection.executemany(
+                "UPDATE meta SET value = value - COALESCE("
+                "(SELECT size FROM entries WHERE func_id = ? AND args_id = ?), 0"
+                ") WHERE key = 'total_size'",
+                call_ids,
+            )
+            self._connection.executemany(
+                "DELETE FROM entries WHERE func_id = ? AND args_id = ?", call_ids
+            )
+
+    def remove_function(self, func_id):
+        "Remove all cached items of function 'func_id' from the index."
+        with self._lock:
+            self._pending_hits = {
+                call_id: hits for call_id, hits in self._pending_hits.items()
+                if call_id[0] != func_id
+            }
+        with self._transaction():
+            removed_size = self._connection.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM entries WHERE func_id = ?", (func_id,)
+            ).fetchone()[0]
+            self._connection.execute("DELETE FROM entries WHERE func_id = ?", (func_id,))
+            self._connection.execute(_ADD_TO_TOTAL_SIZE, (-removed_size,))
+
+    def total_size(self) -> int:
+        "Size of the cache in bytes (running total, accounting for the writes of all processes)."
+        with self._lock:
+            return self._get_meta("total_size") or 0
+
+    def eviction_candidates(self, eviction_policy: str = "lru", limit: int = 256):
+        """
+        List of (call_id, size, priority) of the 'limit' cached items to evict first,
+        according to 'eviction_policy':
+            - "lru": least recently used items first,
+            - "cost": items of lowest GreedyDual-Size priority first.
+        """
+        order = {"lru": "last_access", "cost": "priority"}[eviction_policy]
+        with self._lock:
+            self.flush()
+            rows = self._connection.execute(
+                f"SELECT func_id, args_id, size, priority FROM entries ORDER BY {order} LIMIT ?",
+                (limit,),
+            ).fetchall()
+
+        return [((func_id, args_id), size, priority) for func_id, args_id, size, priority in rows]
+
+    def expired(self, max_age=None):
+        """
+        List of the call_id of the cached items whose time to live has passed,
+        and, if max_age is not None, of the cached items older than max_age seconds.
+        """
+        now = time.time()
+        query = "SELECT func_id, args_id FROM entries WHERE expires < ?"
+        parameters = (now,)
+        if max_age is not None:
+            query += " OR created < ?"
+            parameters = (now, now - max_age)
+        with self._lock:
+            return [tuple(row) for row in self._connection.execute(query, parameters)]
+
+    def inflate(self, priority: float):
+        "Raise the inflation of the cache to the priority of an evicted item (if higher)."
+        with self._lock:
+            # raised within SQLite, as other processes may raise it concurrently
+            self._connection.execute(
+                "INSERT OR IGNORE INTO meta (key, value) VALUES ('inflation', ?)", (priority,)
+            )
+            self._connection.execute(
+                "UPDATE meta SET value = MAX(value, ?) WHERE key = 'inflation'", (priority,)
+            )
+
+    def entries(self, func_id=None):
+        """
+        List of the cached items, as dictionnaries with keys
+        func_id, args_id, size, created, last_access, hits, duration, priority and expires.
+        If 'func_id' is not None, only lists the cached items of this function.
+        """
+        query = (
+            "SELECT func_id, args_id, size, created, last_access, hits, duration, priority, "
+            "expires FROM entries"
+        )
+        with self._lock:
+            self.flush()
+            if func_id is None:
+                cursor = self._connection.execute(query)
+            else:
+                cursor = self._connection.execute(query + " WHERE func_id = ?", (func_id,))
+            columns = [column[0] for column in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def close(self):
+        "Write pending hits and close the connection to the index."
+        with self._lock:
+            self.flush()
+            self._connection.close()
+        _open_indices.discard(self)
@@ -0,0 +1,140 @@
+import hashlib
+import struct
+from pathlib import PurePath
+
+from cachecache.hash_memo import ArgumentDigest
+
+# Prefix of the encoded arguments hashed by FastKey, keeping its args_ids
+# apart from those of joblib's hasher (and from those of later encodings)
+FAST_KEY_PREFIX = b"cachecache.fast_key.v1\x00"
+
+# Maximum nesting depth of containers encoded by FastKey (deeper arguments use joblib's hasher)
+MAX_DEPTH = 32
+
+
+class _Unsupported(Exception):
+    "Raised when an argument cannot be encoded by FastKey."
+
+
+def _encode(obj, parts, depth=0):
+    """
+    Append to 'parts' a deterministic, unambiguous encoding of 'obj' (type tag, then length-prefixed data),
+    made of None, bools, ints, floats, strings, bytes, tuples, lists, dicts, paths
+    and ArgumentDigest (stand-ins for large arguments, see HashMemo) only.
+    Subclasses of these types (enums, numpy scalars...) are not encoded: they raise _Unsupported.
+    """
+    obj_type = type(obj)
+    if obj_type is str:
+        data = obj.encode("utf-8", "surrogatepass")
+        parts.append(b"s%d:" % len(data))
+        parts.append(data)
+    elif obj_type is int:
+        parts.append(b"i%d;" % obj)
+    elif obj is None:
+        parts.append(b"N")
+    elif obj_type is bool:
+        parts.append(b"T" if obj else b"F")
+    elif obj_type is float:
+        parts.append(b"f" + struct.pack("<d", obj))
+    elif obj_type is bytes:
+        parts.append(b"b%d:" % len(obj))
+        parts.append(obj)
+    elif obj_type is tuple or obj_type is list:
+        if depth >= MAX_DEPTH:
+            raise _Unsupported
+        parts.append(b"(%d:" % len(obj) if obj_type is tuple else b"[%d:" % len(obj))
+        for item in obj:
+            _encode(item, parts, depth + 1)
+    elif obj_type is dict:
+        if depth >= MAX_DEPTH:
+            raise _Unsupported
+        # items are sorted by their encoded key, whatever the insertion order and key types
+        items = []
+        for key, value in obj.items():
+            key_parts = []
+            _encode(key, key_parts, depth + 1)
+            items.append((b"".join(key_parts), value))
+        items.sort(key=lambda item: item[0])
+        parts.append(b"{%d:" % len(items))
+        for key, value in items:
+            parts.append(key)
+            _encode(value, parts, depth + 1)
+    elif obj_type is ArgumentDigest:
+        data = f"{obj.kind}:{obj.digest}".encode()
+        parts.append(b"d%d:" % len(data))
+        parts.append(data)
+    elif isinstance(obj, PurePath) and obj_type.__module__ == "pathlib":
+        data = str(obj).encode("utf-8", "surrogatepass")
+        parts.append(b"p%d:" % len(data))
+        parts.append(data)
+    else:
+        raise _Unsupported
+
+
+class FastKey:
+    """
+    Derivation of the args_id of calls whose arguments are only primitives
+    (None, bools, ints, floats, strings, bytes), tuples, lists, dicts and pathlib paths
+    (large arguments being replaced by their ArgumentDigest if the cacher has a HashMemo),
+    without going through joblib's hasher (which pickles the arguments with a pure Python pickler).
+
+    The arguments are bound to their names (filling in default values, leaving out ignored arguments),
+    encoded deterministically (see _encode) and hashed with blake2b into a 32 hexadecimal digits args_id,
+    like joblib's. args_id returns None for calls with any other argument, which are hashed by joblib.
+
+    Arguments:
+        - binder: SignatureBinder of the function
+        - ignore: list, names of the arguments left out of the args_id
+    """
+
+    def __init__(self, binder, ignore=()):
+        self.binder = binder
+        self.ignore = tuple(ignore)
+        parameters = binder.signature.parameters.values()
+        self._required = frozenset(
+            param.name
+            for param in parameters
+            if param.default is param.empty
+            and param.kind not in (param.VAR_POSITIONAL, param.VAR_KEYWORD)
+        )
+        # calls of functions with **kwargs are left to joblib's hasher
+        self.supported = all(param.kind != param.VAR_KEYWORD for param in parameters)
+
+    def __repr__(self):
+        return f"FastKey({self.binder.func_name}, ignore={list(self.ignore)})"
+
+    def args_id(self, args, kwargs):
+        "args_id of a call with 'args' and 'kwargs', or None if they are not all supported."
+        if not self.supported:
+            return None
+
+        binder = self.binder
+        n_positional = len(binder.positional_names)
+        arguments = dict(zip(binder.positional_names, args))
+        if len(args) > n_positional:
+            if binder.var_positional_name is None:
+                return None
+            arguments[binder.var_positional_name] = tuple(args[n_positional:])
+        for name, value in kwargs.items():
+            if name in arguments:
+                # passed twice: left to joblib's hasher, which raises
+                return None
+            arguments[name] = value
+        for name, default in binder.defaults.items():
+            if name not in arguments:
+                arguments[name] = default
+        if not self._required.issubset(arguments):
+            return None
+        for name in self.ignore:
+            arguments.pop(name, None)
+
+        # arguments are encoded in the order of their names
+        parts = [FAST_KEY_PREFIX, b"{%d:" % len(arguments)]
+        try:
+            for name in sorted(arguments):
+                _encode(name, parts)
+                _encode(arguments[name], parts, 1)
+        except _Unsupported:
+            return None
+
+        return hashlib.blake2b(b"".join(parts), digest_size=16).hexdigest()
@@ -0,0 +1,125 @@
+import os
+import socket
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Union
+
+
+class LeaseLock:
+    """
+    Lock file leased to a single process (across machines sharing a filesystem, e.g. over NFS).
+
+    The lock is acquired by creating the lock file exclusively,
+    and held as long as its owner refreshes the file modification time (heartbeat),
+    every third of 'lease_duration'. A lock file not refreshed for 'lease_duration' seconds
+    is considered abandoned (e.g. its owner crashed) and can be taken over by another process.
+
+    Note: stale leases are detected by comparing the lock file modification time to the local clock,
+    so the clocks of the machines sharing the lock should be synchronized to well within 'lease_duration'.
+
+    Arguments:
+        - path: str, path to the lock file
+        - lease_duration: float, time after which a lock file not refreshed is stale, in seconds
+    """
+
+    def __init__(self, path: Union[str, Path], lease_duration: float = 60.0):
+        self.path = str(path)
+        self.lease_duration = lease_duration
+        self.token = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex}"
+        self._heartbeat = None
+        self._released = threading.Event()
+
+    def __repr__(self):
+        return f"LeaseLock({self.path})"
+
+    @property
+    def owned(self) -> bool:
+        "Whether the lock file currently holds the token of this lock."
+        try:
+            with open(self.path) as f:
+                return f.read() == self.token
+        except OSError:
+            return False
+
+    def is_stale(self) -> bool:
+        "Whether the lock file exists and was not refreshed for lease_duration seconds."
+        try:
+            return time.time() - os.stat(self.path).st_mtime > self.lease_duration
+        except FileNotFoundError:
+            return False
+
+    def acquire(self) -> bool:
+        """
+        Try to acquire the lock (without waiting), taking over stale leases.
+        Returns True if the lock was acquired.
+        """
+        if self._create():
+            return True
+
+        if self.is_stale():
+            self._break_stale()
+            return self._create()
+
+        return False
+
+    def release(self):
+        "Release the lock (if still owned)."
+        self._released.set()
+        if self._heartbeat is not None:
+            self._heartbeat.join()
+            self._heartbeat = None
+        if self.owned:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+    def _create(self) -> bool:
+        "Create the lock file exclusively, and start refreshing it."
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        try:
+            fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, "w") as f:
+            f.write(self.token)
+
+        self._released.clear()
+        self._heartbeat = threading.Thread(target=self._refresh, daemon=True)
+        self._heartbeat.start()
+
+        return True
+
+    def _break_stale(self):
+        "Remove a stale lock file (only one of the processes competing to do so succeeds)."
+        stale_path = f"{self.path}.{uuid.uuid4().hex}.stale"
+        try:
+            os.rename(self.path, stale_path)
+        except FileNotFoundError:
+            return
+        # The lease may have been taken over by another process in the meantime,
+        # in which case it is put back (unless yet another lock file was created)
+        if time.time() - os.stat(stale_path).st_mtime <= self.lease_duration:
+            try:
+                os.link(stale_path, self.path)
+            except OSError:
+                pass
+        os.remove(stale_path)
+
+    def _refresh(self):
+        "Heartbeat refreshing the lock file modification time until the lock is released."
+        while not self._released.wait(self.lease_duration / 3):
+            if not self.owned:
+                return
+            try:
+                os.utime(self.path)
+            except OSError:
+                return
@@ -0,0 +1,273 @@
+from collections import OrderedDict
+import os
+import shutil
+import threading
+import time
+import warnings
+
+# Policies deciding which cached items to evict first when a cache is full
+EVICTION_POLICIES = ("lru", "cost")
+
+
+def get_item_size(item_path: str) -> int:
+    """
+    Size in bytes of a cached item (sum of the size of the files of its directory).
+    Returns 0 if the item does not exist.
+    """
+    try:
+        with os.scandir(item_path) as entries:
+            return sum(entry.stat().st_size for entry in entries if entry.is_file())
+    except OSError:
+        return 0
+
+
+class CacheSizeTracker:
+    """
+    Running account of the size of a joblib cache, enforcing its size limit as it grows.
+
+    The size of the cache is counted once, at the first write,
+    then updated at every write and eviction. When a write makes the cache
+    exceed 'bytes_limit', items are evicted until the cache fits in its limit again:
+    the least recently used items first ('lru' eviction policy), or the items of lowest
+    GreedyDual-Size priority first ('cost' eviction policy, see CacheIndex).
+
+    If the cache has a CacheIndex, sizes and access times are read from and written to the index,
+    and the size of the cache is recounted from the index before evicting items
+    (which accounts for items written by other processes).
+    Else, only the writes of the current process are accounted for,
+    the whole cache directory is walked to count the cache,
+    and the 'cost' eviction policy falls back to 'lru'.
+    If the index fails (e.g. locked by another process for too long), a warning is issued
+    and the tracker falls back to walking the cache directory for the rest of the session.
+
+    Arguments:
+        - store_backend: joblib store backend of the cache (Memory.store_backend)
+        - bytes_limit: int, maximum size of the cache in bytes
+        - index: None|CacheIndex, index of the cache
+        - eviction_policy: str, "lru" or "cost"
+    """
+
+    def __init__(self, store_backend, bytes_limit: int, index=None, eviction_policy: str = "lru"):
+        self.store_backend = store_backend
+        self.bytes_limit = bytes_limit
+        self.index = index
+        self.eviction_policy = eviction_policy
+        self.nbytes = None  # unknown until the cache is counted
+        self._items = OrderedDict()  # item path -> size, least recently used first (no index)
+        self._lock = threading.Lock()
+
+    def item_path(self, call_id) -> str:
+        "Path to the directory of the cached item 'call_id'."
+        return os.path.join(self.store_backend.location, *call_id)
+
+    def disable_index(self, error):
+        "Stop using the index of the cache after it raised 'error', and recount the cache without it."
+        with self._lock:
+            index, self.index = self.index, None
+        if index is None:
+            return
+
+        warnings.warn(
+            f"cachecache could not use the index of the cache at {self.store_backend.location} "
+            f"({error}) - the cache directory will be walked to enforce the cache size limit."
+        )
+        try:
+            index.close()
+        except index.Error:
+            pass
+        self.count()
+
+    def count(self):
+        "(Re)count the size of the cache, from its index or walking its whole directory."
+        index = self.index
+        if index is not None:
+            try:
+                nbytes = index.total_size()
+            except index.Error as error:
+                self.disable_index(error)
+                return
+            with self._lock:
+                self.nbytes = nbytes
+            return
+
+        items = sorted(self.store_backend.get_items(), key=lambda item: item.last_access)
+        with self._lock:
+            self._items = OrderedDict((item.path, item.size) for item in items)
+            self.nbytes = sum(self._items.values())
+
+    def record_access(self, call_id):
+        "Mark the cached item 'call_id' as recently used."
+        index = self.index
+        if index is not None:
+            try:
+                index.record_hit(call_id)
+            except index.Error as error:
+                self.disable_index(error)
+            return
+
+        with self._lock:
+            path = self.item_path(call_id)
+            if path in self._items:
+                self._items.move_to_end(path)
+
+    def record_write(self, call_id, duration=None, ttl=None):
+        """
+        Account for the cached item 'call_id' just written, evicting items if needed,
+        and return its size in bytes.
+        - duration: float, time taken to compute the item in seconds
+        - ttl: None|float, time to live of the item in seconds (only recorded by the index)
+        """
+        if self.nbytes is None:
+            self.count()
+
+        index = self.index
+        if index is not None:
+            try:
+                size, added_size = index.record_write(call_id, duration, ttl)
+            except index.Error as error:
+                # the cache is recounted without the index, including the item just written
+                self.disable_index(error)
+            else:
+                with self._lock:
+                    self.nbytes += added_size
+                    over_limit = self.nbytes > self.bytes_limit
+                if over_limit:
+                    self._evict_indexed()
+                return size
+
+        path = self.item_path(call_id)
+        size = get_item_size(path)
+        with self._lock:
+            self.nbytes += size - self._items.pop(path, 0)
+            self._items[path] = size
+            evicted_paths = self._evict()
+
+        for evicted_path in evicted_paths:
+            shutil.rmtree(evicted_path, ignore_errors=True)
+
+        return size
+
+    def record_removal(self, call_id):
+        "Account for the cached item 'call_id' removed from the cache."
+        index = self.index
+        if index is not None:
+            try:
+                index.remove([call_id])
+            except index.Error as error:
+                self.disable_index(error)
+            else:
+                self.count()
+            return
+
+        with self._lock:
+            size = self._items.pop(self.item_path(call_id), 0)
+            if self.nbytes is not None:
+                self.nbytes -= size
+
+    def clear_expired(self, max_age=None):
+        """
+        Remove the cached items whose time to live has passed (only known by the index),
+        and, if max_age is not None, the cached items older than max_age seconds.
+        Returns the list of the call_id of the removed items.
+        """
+        index = self.index
+        if index is not None:
+            try:
+                expired_call_ids = index.expired(max_age)
+            except index.Error as error:
+                self.disable_index(error)
+                # items without their time to live are only cleared if older than max_age
+                return self.clear_expired(max_age)
+        elif max_age is not None:
+            now = time.time()
+            expired_call_ids = []
+            for item in self.store_backend.get_items():
+                func_path, args_id = os.path.split(item.path)
+                call_id = (os.path.relpath(func_path, self.store_backend.location), args_id)
+                created = self.store_backend.get_metadata(call_id).get("time", 0)
+                if now - created > max_age:
+                    expired_call_ids.append(call_id)
+        else:
+            return []
+
+        for call_id in expired_call_ids:
+            shutil.rmtree(self.item_path(call_id), ignore_errors=True)
+        if index is not None:
+            try:
+                index.remove(expired_call_ids)
+            except index.Error as error:
+                self.disable_index(error)
+            else:
+                self.count()
+        else:
+            for call_id in expired_call_ids:
+                self.record_removal(call_id)
+
+        return expired_call_ids
+
+    def remove_function(self, func_id):
+        "Account for all the cached items of function 'func_id' removed from the cache."
+        index = self.index
+        if index is not None:
+            try:
+                index.remove_function(func_id)
+            except index.Error as error:
+                self.disable_index(error)
+                return
+        self.count()
+
+    def entries(self, func_id=None):
+        """
+        List of the cached items found in the index (see CacheIndex.entries),
+        of function 'func_id' only if not None. Empty if the cache has no index.
+        """
+        index = self.index
+        if index is None:
+            return []
+        try:
+            return index.entries(func_id)
+        except index.Error as error:
+            self.disable_index(error)
+            return []
+
+    def _evict(self):
+        "Drop least recently used items until the cache fits in its limit, returns their paths."
+        evicted_paths = []
+        while self.nbytes > self.bytes_limit and self._items:
+            path, size = self._items.popitem(last=False)
+            self.nbytes -= size
+            evicted_paths.append(path)
+
+        return evicted_paths
+
+    def _evict_indexed(self):
+        "Remove items of the index, following the eviction policy, until the cache fits in its limit."
+        index = self.index
+        try:
+            # Other processes may have written to (or evicted from) the cache too
+            nbytes = index.total_size()
+            while nbytes > self.bytes_limit:
+                candidates = index.eviction_candidates(self.eviction_policy)
+                if not candidates:
+                    break
+                evicted_call_ids = []
+                for call_id, size, priority in candidates:
+                    shutil.rmtree(self.item_path(call_id), ignore_errors=True)
+                    evicted_call_ids.append(call_id)
+                    nbytes -= size
+                    if self.eviction_policy == "cost":
+                        index.inflate(priority)
+                    if nbytes <= self.bytes_limit:
+                        break
+                index.remove(evicted_call_ids)
+        except index.Error as error:
+            # recounted walking the cache directory, then evicted without the index
+            self.disable_index(error)
+            with self._lock:
+                evicted_paths = self._evict()
+            for evicted_path in evicted_paths:
+                shutil.rmtree(evicted_path, ignore_errors=True)
+            return
+
+        with self._lock:
+            self.nbytes = nbytes
@@ -0,0 +1,226 @@
+import contextvars
+import math
+import threading
+import time
+
+# Counters of CacheStats: calls served from the cache (hits), computed because not cached
+# (misses) or because recomputation was requested (refreshes, again=True), calls bypassing
+# the cache (cache_results=False or cache not writable), and bytes read from and written to the disk
+COUNTERS = ("hits", "misses", "refreshes", "bypasses", "bytes_read", "bytes_written")
+
+# Stages of cached calls timed by CacheStats: hashing the arguments into a key,
+# looking the key up in the cache, loading (deserializing) cached results,
+# computing results and writing them to the disk cache
+STAGES = ("hash", "lookup", "deserialize", "compute", "write")
+
+# Stages of cached calls timed by CallEvent: STAGES, plus binding the arguments
+# to their names and selecting the cache (opening it at the first call with a cache_path)
+EVENT_STAGES = ("bind", "select") + STAGES
+
+# Outcome of a call, for each counter of CacheStats
+OUTCOMES = {"hits": "hit", "misses": "miss", "refreshes": "refresh", "bypasses": "bypass"}
+
+# CallEvent of the call running in the current thread (or task), if the cacher has hooks
+current_event = contextvars.ContextVar("cachecache_current_event", default=None)
+
+
+class CallEvent:
+    """
+    Record of a call of a cached function, passed to the hooks of its cacher (see Cacher.add_hook)
+    once the call returns (or raises).
+
+    Attributes:
+        - func: the decorated function
+        - location: None|str, directory of the cache used by the call
+        - outcome: None|str, "hit", "miss", "refresh" or "bypass" (None if the call raised before)
+        - start: float, time at which the call started (time.time())
+        - duration: float, duration of the call in seconds
+        - timings: dict, duration in seconds of each stage the call went through (see EVENT_STAGES)
+                   (results written in the background (write-behind) have no 'write' timing)
+        - bytes_read: int, bytes of cached results read from the disk
+        - bytes_written: int, bytes of results written to the disk
+        - error: None|BaseException, exception raised by the call
+    """
+
+    __slots__ = (
+        "func", "location", "outcome", "start", "duration", "timings",
+        "bytes_read", "bytes_written", "error", "_start_counter",
+    )
+
+    def __init__(self, func):
+        self.func = func
+        self.location = None
+        self.outcome = None
+        self.start = time.time()
+        self.duration = None
+        self.timings = {}
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.error = None
+        self._start_counter = time.perf_counter()
+
+    def __repr__(self):
+        timings = ", ".join(f"{stage}={seconds * 1e3:.3f}ms" for stage, seconds in self.timings.items())
+        return f"CallEvent({self.func.__qualname__}, {self.outcome}, {timings})"
+
+    def add_time(self, stage: str, seconds: float):
+        "Add the duration of a 'stage' (one of EVENT_STAGES) of the call, in seconds."
+        self.timings[stage] = self.timings.get(stage, 0.0) + seconds
+
+    def finish(self):
+        "Set the duration of the call."
+        self.duration = time.perf_counter() - self._start_counter
+
+
+def record_stage(stage: str, seconds: float):
+    "Add the duration of a 'stage' (one of EVENT_STAGES) to the CallEvent of the current call, if any."
+    event = current_event.get()
+    if event is not None:
+        event.add_time(stage, seconds)
+
+
+class LatencyHistogram:
+    """
+    Histogram of durations, in buckets of powers of two seconds
+    (from 2**min_exponent, about 1 microsecond, to 2**max_exponent, about 17 minutes).
+
+    Not thread-safe on its own (see CacheStats).
+    """
+
+    min_exponent = -19
+    max_exponent = 10
+
+    def __init__(self):
+        self.counts = [0] * (self.max_exponent - self.min_exponent + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        "Add a duration (in seconds) to the histogram."
+        exponent = math.frexp(seconds)[1] if seconds > 0 else self.min_exponent
+        exponent = min(max(exponent, self.min_exponent), self.max_exponent)
+        self.counts[exponent - self.min_exponent] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other: "LatencyHistogram"):
+        "Add the durations of histogram 'other' to the histogram."
+        self.counts = [count + other_count for count, other_count in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def percentile(self, q: float) -> float:
+        "Upper bound of the bucket holding the q-th percentile (0 <= q <= 100), in seconds."
+        if self.count == 0:
+            return 0.0
+        rank = q / 100 * self.count
+        cumulated = 0
+        for i, count in enumerate(self.counts):
+            cumulated += count
+            if cumulated >= rank and count:
+                return min(2.0 ** (self.min_exponent + i), self.max)
+
+        return self.max
+
+    def summary(self) -> dict:
+        "Dictionnary of count, total, mean, min, p50, p90, p99 and max durations, and non-empty buckets."
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "min": self.min if self.count else 0.0,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "max": self.max,
+            # upper bound of bucket (seconds) -> number of durations
+            "buckets": {
+                2.0 ** (self.min_exponent + i): count for i, count in enumerate(self.counts) if count
+            },
+        }
+
+
+class CacheStats:
+    """
+    Thread-safe counters (see COUNTERS) and latency histograms (see STAGES) of cached calls.
+
+    Every cached call counts as exactly one of a hit, a miss, a refresh or a bypass.
+    Calls served with the results of an identical call running concurrently count as hits.
+
+    Counts and durations are also recorded in the CallEvent of the current call, if any.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def __repr__(self):
+        counts = ", ".join(f"{name}={self.counts[name]}" for name in COUNTERS)
+        return f"CacheStats({counts})"
+
+    def record(self, counter: str, n: int = 1):
+        "Add n to 'counter' (one of COUNTERS)."
+        with self._lock:
+            self.counts[counter] += n
+
+        event = current_event.get()
+        if event is not None:
+            if counter in OUTCOMES:
+                event.outcome = OUTCOMES[counter]
+            elif counter == "bytes_read":
+                event.bytes_read += n
+            elif counter == "bytes_written":
+                event.bytes_written += n
+
+    def record_time(self, stage: str, seconds: float):
+        "Add the duration of a 'stage' (one of STAGES) of a call, in seconds."
+        with self._lock:
+            self.latencies[stage].record(seconds)
+
+        event = current_event.get()
+        if event is not None:
+            event.add_time(stage, seconds)
+
+    def reset(self):
+        "Reset all counters and histograms to zero."
+        with self._lock:
+            self.counts = dict.fromkeys(COUNTERS, 0)
+            self.latencies = {stage: LatencyHistogram() for stage in STAGES}
+
+    def merge(self, other: "CacheStats"):
+        "Add the counters and histograms of 'other' to these."
+        with other._lock:
+            counts = dict(other.counts)
+            latencies = {stage: LatencyHistogram() for stage in STAGES}
+            for stage, histogram in other.latencies.items():
+                latencies[stage].merge(histogram)
+        with self._lock:
+            for name, count in counts.items():
+                self.counts[name] += count
+            for stage, histogram in latencies.items():
+                self.latencies[stage].merge(histogram)
+
+    def snapshot(self) -> dict:
+        """
+        Dictionnary of the counters (see COUNTERS), of the number of calls,
+        of the hit rate (hits over calls going through the cache),
+        and of the latency summary of each stage (see STAGES and LatencyHistogram.summary).
+        """
+        with self._lock:
+            snapshot = dict(self.counts)
+            latencies = {stage: histogram.summary() for stage, histogram in self.latencies.items()}
+
+        cached_calls = snapshot["hits"] + snapshot["misses"] + snapshot["refreshes"]
+        snapshot["calls"] = cached_calls + snapshot["bypasses"]
+        snapshot["hit_rate"] = snapshot["hits"] / cached_calls if cached_calls else 0.0
+        snapshot["latency"] = latencies
+
+        return snapshot
@@ -1,6 +1,7 @@
 from pathlib import Path
 import shutil
 import os
+import sys
 from typing import Union
 
 def has_write_permission(path: Union[str, Path]) -> bool:
@@ -49,4 +50,65 @@ def has_space_left(path: Union[str, Path],
 def is_writable(path: Union[str, Path],
                 required_space_mb: float = 100) -> bool:
     
-    return has_space_left(path, required_space_mb) & has_write_permission(path)
\ No newline at end of file
+    return has_space_left(path, required_space_mb) & has_write_permission(path)
+
+def estimate_size(obj, _seen=None) -> int:
+    """
+    Estimate the memory footprint of obj in bytes.
+
+    Buffers (numpy arrays, bytes...) are measured with their 'nbytes' attribute
+    (or length), containers are measured recursively,
+    and other objects are measured with sys.getsizeof.
+    """
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+
+    size = sys.getsizeof(obj, 0)
+    nbytes = getattr(obj, "nbytes", None)
+    if isinstance(nbytes, int):
+        size = max(size, nbytes)
+    elif isinstance(obj, dict):
+        size += sum(
+            estimate_size(k, _seen) + estimate_size(v, _seen) for k, v in obj.items()
+        )
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item, _seen) for item in obj)
+    elif hasattr(obj, "__dict__"):
+        size += estimate_size(vars(obj), _seen)
+
+    return size
+
+# Types of network filesystems, as listed in /proc/mounts
+NETWORK_FILESYSTEMS = frozenset([
+    "nfs", "nfs4", "cifs", "smb3", "smbfs", "ncpfs", "afs", "9p", "ceph", "glusterfs",
+    "lustre", "gpfs", "beegfs", "fuse.sshfs", "fuse.glusterfs", "fuse.cephfs", "fuse.s3fs",
+])
+
+def filesystem_type(path: Union[str, Path]) -> Union[str, None]:
+    """
+    Type of the filesystem holding 'path' (e.g. "ext4", "nfs4"), as listed in /proc/mounts.
+    Returns None if unknown (e.g. on systems without /proc/mounts).
+    """
+    path = os.path.realpath(path)
+    try:
+        with open("/proc/mounts") as f:
+            mounts = [line.split()[1:3] for line in f if len(line.split()) > 2]
+    except OSError:
+        return None
+
+    # filesystem of the longest mount point containing path
+    fs_type, mount_point_length = None, -1
+    for mount_point, mount_fs_type in mounts:
+        mount_point = mount_point.replace("\\040", " ")
+        if (path == mount_point or path.startswith(mount_point.rstrip("/") + "/")) \
+                and len(mount_point) > mount_point_length:
+            fs_type, mount_point_length = mount_fs_type, len(mount_point)
+
+    return fs_type
+
+def is_network_filesystem(path: Union[str, Path]) -> bool:
+    "Whether 'path' is on a network filesystem (False if unknown)."
+    return filesystem_type(path) in NETWORK_FILESYSTEMS
@@ -0,0 +1,130 @@
+import atexit
+import os
+import queue
+import threading
+import traceback
+import warnings
+import weakref
+
+# Write-behind queues to flush when the interpreter exits
+_open_write_behinds = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_open_write_behinds():
+    for write_behind in list(_open_write_behinds):
+        write_behind.flush()
+
+
+def _reset_open_write_behinds():
+    "Reset the write-behind queues in a child process created by os.fork()."
+    for write_behind in list(_open_write_behinds):
+        write_behind._reset()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_open_write_behinds)
+
+
+class WriteBehind:
+    """
+    Background persistence of computed results.
+
+    Results are handed over with submit(key, results, write) and returned to the caller right away,
+    while 'write' (which writes them to the disk cache) runs in one of 'max_workers' background threads.
+    Until written, results are served from memory by get(key).
+
+    The queue of pending writes is bounded by 'max_pending':
+    submit() blocks while the queue is full, which bounds the memory held by pending results.
+    Pending writes are flushed when the interpreter exits.
+    Pending results can be dropped with discard(predicate), e.g. when their cache is invalidated.
+
+    In a child process created by os.fork(), the queue starts empty (the results pending
+    in the parent process are written by the parent process), and new workers are started.
+
+    Arguments:
+        - max_workers: int, number of background threads writing results
+        - max_pending: int, maximum number of results waiting to be written
+    """
+
+    def __init__(self, max_workers: int = 1, max_pending: int = 8):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._reset()
+        _open_write_behinds.add(self)
+
+    def _reset(self):
+        "Start with an empty queue and no workers (at creation, and in forked child processes)."
+        self._queue = queue.Queue(maxsize=self.max_pending)
+        self._pending = {}  # key -> (results, write id)
+        self._cancelled = set()  # write ids of discarded writes, still queued
+        self._writing = {}  # write id -> key, of the writes running
+        self._lock = threading.Lock()
+        self._written = threading.Condition(self._lock)
+        self._n_writes = 0
+        self._workers = []
+
+    def __len__(self):
+        return len(self._pending)
+
+    def get(self, key, default=None):
+        "Return the results waiting to be written at 'key' (default if none)."
+        pending = self._pending.get(key)
+        return default if pending is None else pending[0]
+
+    def submit(self, key, results, write):
+        """
+        Hold 'results' in memory at 'key' until write() returns,
+        write() being called in a background thread.
+        """
+        with self._lock:
+            self._n_writes += 1
+            write_id = self._n_writes
+            self._pending[key] = (results, write_id)
+            if len(self._workers) < self.max_workers:
+                worker = threading.Thread(target=self._work, daemon=True)
+                worker.start()
+                self._workers.append(worker)
+
+        self._queue.put((key, write_id, write))
+
+    def flush(self):
+        "Wait until all pending results are written."
+        self._queue.join()
+
+    def discard(self, predicate):
+        """
+        Drop the pending results whose key satisfies predicate(key): they are no longer served
+        by get(key), and their queued writes are skipped. Returns once the writes of such results
+        that were already running are done, so that the caller can then remove them from the cache.
+        """
+        with self._lock:
+            for key in [key for key in self._pending if predicate(key)]:
+                _, write_id = self._pending.pop(key)
+                self._cancelled.add(write_id)
+            while any(predicate(key) for key in self._writing.values()):
+                self._written.wait()
+
+    def _work(self):
+        while True:
+            key, write_id, write = self._queue.get()
+            with self._lock:
+                cancelled = write_id in self._cancelled
+                self._cancelled.discard(write_id)
+                if not cancelled:
+                    self._writing[write_id] = key
+            try:
+                if not cancelled:
+                    write()
+            except Exception:
+                warnings.warn(
+                    f"cachecache could not write results to the cache:\n{traceback.format_exc()}"
+                )
+            finally:
+                with self._lock:
+                    self._writing.pop(write_id, None)
+                    # results submitted again since then are still pending
+                    if self._pending.get(key, (None, None))[1] == write_id:
+                        del self._pending[key]
+                    self._written.notify_all()
+                self._queue.task_done()
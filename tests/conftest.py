@@ -0,0 +1,14 @@
+import os
+import shutil
+import tempfile
+
+import pytest
+
+
+@pytest.fixture
+def cache_dir():
+    "Temporary cache directory, on a tmpfs (/dev/shm) if there is one."
+    parent = "/dev/shm" if os.path.isdir("/dev/shm") else None
+    path = tempfile.mkdtemp(prefix="cachecache_test_", dir=parent)
+    yield path
+    shutil.rmtree(path, ignore_errors=True)
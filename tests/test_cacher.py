@@ -0,0 +1,167 @@
+import os
+
+import pytest
+
+from cachecache import Cacher
+from cachecache import cachecache as cachecache_module
+
+
+def test_memorized_funcs_dropped_with_evicted_caches(cache_dir):
+    cacher = Cacher(os.path.join(cache_dir, "global"), memory_pool_size=2)
+
+    @cacher
+    def double(x, cache_path=None):
+        return 2 * x
+
+    for i in range(5):
+        assert double(i, cache_path=os.path.join(cache_dir, f"cache_{i}")) == 2 * i
+
+    locations = {key[1] for key in cacher._memorized_funcs}
+    assert len(locations) == 2
+    assert len(cacher.memory_pool) == 2
+
+
+def test_memorized_funcs_bounded(cache_dir, monkeypatch):
+    monkeypatch.setattr(cachecache_module, "MAX_MEMORIZED_FUNCS", 3)
+    cacher = Cacher(cache_dir)
+
+    for i in range(5):
+        cached_func = cacher(lambda x, i=i: x + i)
+        assert cached_func(1) == 1 + i
+
+    assert len(cacher._memorized_funcs) == 3
+
+
+def test_submit(cache_dir):
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(2) as executor:
+        cacher = Cacher(cache_dir, executor=executor)
+        double = cacher(lambda x: 2 * x)
+        assert [future.result() for future in map(double.submit, range(4))] == [0, 2, 4, 6]
+
+    # results held by the memory tier are returned right away
+    cacher = Cacher(os.path.join(cache_dir, "tier"), memory_tier_bytes=10**6)
+    double = cacher(lambda x: 2 * x)
+    double(3)
+    assert double.submit(3).done()
+
+
+def test_process_pool_executor_rejected(cache_dir):
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(1) as executor:
+        with pytest.raises(ValueError, match="ThreadPoolExecutor"):
+            Cacher(cache_dir, executor=executor)
+        cacher = Cacher(cache_dir)
+        with pytest.raises(ValueError, match="ThreadPoolExecutor"):
+            cacher.executor = executor
+
+
+def test_default_keys_are_joblib_keys(cache_dir):
+    from joblib import Memory
+
+    def add(x, y=1):
+        return x + y
+
+    cacher = Cacher(cache_dir)
+    cached_add = cacher(add)
+    assert cached_add(1, y=2) == 3
+    # so that results cached by earlier versions of cachecache are found
+    [item] = cacher.cached_items(cached_add)
+    assert item["args_id"] == Memory(cache_dir, verbose=0).cache(add)._get_args_id(1, y=2)
+
+
+def test_memory_tier_survives_rebuilt_memorized_funcs(cache_dir, monkeypatch):
+    monkeypatch.setattr(cachecache_module, "MAX_MEMORIZED_FUNCS", 2)
+    cacher = Cacher(cache_dir, memory_tier_bytes=10**6)
+    funcs = [cacher(lambda x, i=i: [x + i]) for i in range(3)]
+
+    for func in funcs:
+        func(1)
+    loads = []
+    monkeypatch.setattr(Cacher, "_load", lambda self, *args: loads.append(args) or None)
+    for func in funcs:
+        func(1)
+
+    assert loads == []
+    assert len(cacher.memory_tier) == 3
+
+
+def test_memorized_funcs_least_recently_used_dropped(cache_dir, monkeypatch):
+    monkeypatch.setattr(cachecache_module, "MAX_MEMORIZED_FUNCS", 2)
+    cacher = Cacher(cache_dir)
+    first, second, third = (cacher(lambda x, i=i: x + i) for i in range(3))
+
+    first(1)
+    second(1)
+    first(1)
+    third(1)
+
+    assert {key[0] for key in cacher._memorized_funcs} == {first.__wrapped__, third.__wrapped__}
+
+
+def test_submitted_hits_loaded_by_the_executor(cache_dir, monkeypatch):
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    cacher = Cacher(cache_dir, executor=ThreadPoolExecutor(4))
+    double = cacher(lambda x: 2 * x)
+    for x in range(4):
+        double(x)
+
+    load_threads = []
+    original_load = Cacher._load
+
+    def recording_load(self, *args, **kwargs):
+        load_threads.append(threading.current_thread())
+        return original_load(self, *args, **kwargs)
+
+    monkeypatch.setattr(Cacher, "_load", recording_load)
+    futures = [double.submit(x) for x in range(4)]
+
+    assert [future.result() for future in futures] == [0, 2, 4, 6]
+    assert len(load_threads) == 4
+    assert threading.current_thread() not in load_threads
+
+
+def test_corrupted_results_recomputed_with_warning(cache_dir):
+    import glob
+
+    calls = []
+    cacher = Cacher(cache_dir)
+
+    @cacher
+    def square(x):
+        calls.append(x)
+        return x * x
+
+    assert square(3) == 9
+    [output_path] = glob.glob(os.path.join(cache_dir, "**", "output.pkl"), recursive=True)
+    with open(output_path, "wb") as f:
+        f.write(b"not a pickle")
+
+    with pytest.warns(UserWarning, match="Exception while loading the cached results"):
+        assert square(3) == 9
+    assert calls == [3, 3]
+    assert square(3) == 9
+    assert calls == [3, 3]
+
+
+def test_again_on_cold_key_computes_once(cache_dir):
+    calls = []
+    cacher = Cacher(cache_dir)
+
+    @cacher
+    def square(x, again=False):
+        calls.append(x)
+        return x * x
+
+    assert square(4, again=True) == 16
+    assert calls == [4]
+    assert square(4) == 16
+    assert calls == [4]
+    assert square(4, again=True) == 16
+    assert calls == [4, 4]
+    stats = square.cache_stats()
+    assert (stats["misses"], stats["refreshes"], stats["hits"]) == (0, 2, 1)
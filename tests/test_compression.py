@@ -0,0 +1,41 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+pytest.importorskip("zstandard")
+
+_SCRIPT = """
+import sys
+from cachecache import Cacher
+
+n_calls = []
+
+def sequence(n):
+    n_calls.append(n)
+    return list(range(n))
+
+cacher = Cacher(sys.argv[1])
+cached_sequence = cacher(compress={compress})(sequence)
+assert cached_sequence(1000) == list(range(1000))
+print(len(n_calls))
+"""
+
+
+def _run(cache_dir, compress):
+    "Number of computations of a cached call in a new process, caching with 'compress'."
+    env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    output = subprocess.run(
+        [sys.executable, "-c", textwrap.dedent(_SCRIPT.format(compress=compress)), cache_dir],
+        env=env, check=True, capture_output=True, text=True,
+    ).stdout
+
+    return int(output.split()[-1])
+
+
+def test_zstd_results_loaded_by_other_processes(cache_dir):
+    assert _run(cache_dir, '"zstd"') == 1
+    # a process that does not compress with zstd itself
+    assert _run(cache_dir, "False") == 0
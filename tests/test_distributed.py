@@ -0,0 +1,67 @@
+import os
+
+from cachecache import Cacher, distributed_cacher
+
+
+def _counting_distributed_func(cache_dir):
+    calls = []
+
+    @distributed_cacher(global_cache=Cacher(os.path.join(cache_dir, "global")))
+    def count(x, datapath=None, cache_path=None):
+        calls.append((x, datapath))
+        return x
+
+    return count, calls
+
+
+def test_submit_and_map_use_local_caches(cache_dir):
+    count, calls = _counting_distributed_func(cache_dir)
+    first, second = os.path.join(cache_dir, "first"), os.path.join(cache_dir, "second")
+    os.makedirs(first)
+    os.makedirs(second)
+
+    assert count.submit(1, first).result() == 1
+    assert os.path.isdir(os.path.join(first, ".local_cache"))
+    assert count(1, datapath=first) == 1
+    assert calls == [(1, first)]
+
+    assert count.map([(1, first), (2, second), {"x": 3}, (2, second)]) == [1, 2, 3, 2]
+    assert calls == [(1, first), (2, second), (3, None)]
+    assert os.path.isdir(os.path.join(second, ".local_cache"))
+    assert count(2, second) == 2 and count(3) == 3
+    assert len(calls) == 3
+
+
+def test_datapath_from_positional_keyword_and_default_arguments(cache_dir):
+    positional, keyword, default = (
+        os.path.join(cache_dir, name) for name in ("positional", "keyword", "default")
+    )
+    for datapath in (positional, keyword, default):
+        os.makedirs(datapath)
+
+    @distributed_cacher(global_cache=Cacher(os.path.join(cache_dir, "global")))
+    def identity(x, datapath=default, cache_path=None):
+        return x
+
+    assert identity(1, positional) == 1
+    assert identity(2, datapath=keyword) == 2
+    assert identity(3) == 3
+    for datapath in (positional, keyword, default):
+        assert os.path.isdir(os.path.join(datapath, ".local_cache"))
+
+    # an explicit cache_path prevails over the datapath
+    explicit = os.path.join(cache_dir, "explicit")
+    assert identity(4, positional, cache_path=explicit) == 4
+    assert os.path.isdir(explicit)
+
+
+def test_non_path_datapath_uses_global_cache(cache_dir):
+    global_cache = Cacher(os.path.join(cache_dir, "global"))
+
+    @distributed_cacher(global_cache=global_cache)
+    def identity(x, datapath=None, cache_path=None):
+        return x
+
+    assert identity(1) == 1
+    assert identity(2, datapath=42) == 2
+    assert len(global_cache.cached_items(identity)) == 2
@@ -0,0 +1,44 @@
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from cachecache import Cacher
+
+pytestmark = pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(), reason="requires the fork start method"
+)
+
+
+def _run_in_forked_child(target, *args, timeout=30):
+    "Return target(*args), run in a child process created by os.fork()."
+    context = multiprocessing.get_context("fork")
+    results = context.Queue()
+    child = context.Process(target=lambda: results.put(target(*args)))
+    child.start()
+    child.join(timeout=timeout)
+    if child.is_alive():
+        child.kill()
+        pytest.fail("the forked child process hung")
+    assert child.exitcode == 0
+
+    return results.get(timeout=1)
+
+
+def test_hash_threads_in_forked_child(cache_dir):
+    np = pytest.importorskip("numpy")
+    cacher = Cacher(cache_dir, digest_keys=True, hash_threads=4)
+    total = cacher(lambda array: float(array.sum()))
+    array = np.ones(2**23)  # 64MB, hashed in 4 chunks
+
+    assert total(array) == 2**23
+    assert _run_in_forked_child(total, array[::-1].copy()) == 2**23
+
+
+@pytest.mark.parametrize("executor", [None, "thread_pool"])
+def test_submit_in_forked_child(cache_dir, executor):
+    cacher = Cacher(cache_dir, executor=ThreadPoolExecutor(2) if executor else None)
+    double = cacher(lambda x: 2 * x)
+
+    assert double.submit(1).result() == 2
+    assert _run_in_forked_child(lambda: double.submit(2).result()) == 4
@@ -0,0 +1,124 @@
+import os
+
+import pytest
+
+from cachecache import Cacher
+
+np = pytest.importorskip("numpy")
+
+
+def _args_id(cacher, func, *args):
+    "args_id of the call func(*args) cached by 'cacher'."
+    cached_func = cacher(func)
+    cached_func(*args)
+    [item] = cacher.cached_items(cached_func)
+    return item["args_id"]
+
+
+def total(array):
+    return float(array.sum())
+
+
+def test_digest_keys_do_not_depend_on_hash_threads(cache_dir):
+    array = np.arange(2**23, dtype=np.float64)  # 64MB, 4 chunks
+
+    args_ids = {
+        _args_id(Cacher(os.path.join(cache_dir, str(n_threads)), digest_keys=True,
+                        hash_threads=n_threads), total, array)
+        for n_threads in (1, 4)
+    }
+    args_ids.add(
+        _args_id(Cacher(os.path.join(cache_dir, "memo"), hash_memo=True, hash_threads=4), total, array)
+    )
+    assert len(args_ids) == 1
+
+    # arrays hashed by joblib's hasher
+    joblib_args_id = _args_id(Cacher(os.path.join(cache_dir, "joblib")), total, array)
+    assert joblib_args_id not in args_ids
+
+
+def test_hash_threads_requires_digest_keys(cache_dir):
+    with pytest.raises(ValueError, match="digest_keys"):
+        Cacher(cache_dir, hash_threads=4)
+
+
+def _counting_digests(monkeypatch):
+    "List of the arrays hashed by HashMemo."
+    from cachecache import hash_memo
+
+    hashed = []
+    array_digest = hash_memo.array_digest
+
+    def counting_array_digest(array, executor=None):
+        hashed.append(array)
+        return array_digest(array, executor)
+
+    monkeypatch.setattr(hash_memo, "array_digest", counting_array_digest)
+    return hashed
+
+
+def test_digests_reused_only_for_frozen_arrays(monkeypatch):
+    from cachecache.hash_memo import HashMemo
+
+    hashed = _counting_digests(monkeypatch)
+    memo = HashMemo(min_bytes=1024)
+
+    writeable = np.zeros(1024)
+    digest = memo.digest(writeable).digest
+    writeable[0] = 1
+    assert memo.digest(writeable).digest != digest
+    assert len(hashed) == 2
+
+    frozen = np.zeros(1024)
+    frozen.flags.writeable = False
+    assert memo.digest(frozen).digest == digest
+    assert memo.digest(frozen).digest == digest
+    assert len(hashed) == 3
+
+    # read-only views of writeable memory are hashed at every call
+    view = writeable[:]
+    view.flags.writeable = False
+    memo.digest(view)
+    memo.digest(view)
+    assert len(hashed) == 5
+
+    # small arrays are hashed as is
+    assert memo.digest(np.zeros(8)) is None
+
+
+class Table:
+    def __init__(self, rows):
+        self.rows = rows
+
+
+def test_declared_versions(cache_dir):
+    calls = []
+    cacher = Cacher(cache_dir, hash_memo=True)
+
+    @cacher
+    def count_rows(table):
+        calls.append(len(table.rows))
+        return len(table.rows)
+
+    table = Table([1, 2])
+    cacher.declare_version(table, 1)
+    assert count_rows(table) == 2
+    assert count_rows(table) == 2
+    assert calls == [2]
+
+    # the digest of the declared version is reused, even if the table changed
+    table.rows.append(3)
+    assert count_rows(table) == 2
+    # until its version changes
+    cacher.declare_version(table, 2)
+    assert count_rows(table) == 3
+    assert calls == [2, 3]
+
+    # the version is forgotten with the object
+    del table
+    assert len(cacher.hash_memo._versions) == 0
+
+
+def test_declare_version_requires_hash_memo(cache_dir):
+    with pytest.raises(ValueError, match="hash memo"):
+        Cacher(cache_dir).declare_version(object(), 1)
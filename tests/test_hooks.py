@@ -0,0 +1,73 @@
+from cachecache import Cacher
+
+
+def _recording_cacher(cache_dir):
+    events = []
+    cacher = Cacher(cache_dir, hooks=[events.append])
+
+    @cacher
+    def double(x, cache_results=True):
+        return 2 * x
+
+    return double, events
+
+
+def test_hook_timings_and_outcome(cache_dir):
+    double, events = _recording_cacher(cache_dir)
+
+    assert double(1) == 2
+    assert double(1) == 2
+    assert double(1, cache_results=False) == 2
+
+    miss, hit, bypass = events
+    assert [event.outcome for event in events] == ["miss", "hit", "bypass"]
+    assert miss.location == hit.location is not None
+    assert {"bind", "select", "compute", "write"} <= set(miss.timings)
+    assert {"bind", "select"} <= set(hit.timings) and "compute" not in hit.timings
+    assert miss.bytes_written > 0 and hit.bytes_read > 0
+    for event in events:
+        assert event.error is None
+        assert event.duration >= sum(event.timings.values()) - 1e-6
+
+
+def test_hook_error(cache_dir):
+    events = []
+    cacher = Cacher(cache_dir, hooks=[events.append])
+
+    @cacher
+    def fail(x):
+        raise KeyError(x)
+
+    try:
+        fail(1)
+    except KeyError:
+        pass
+    [event] = events
+    assert isinstance(event.error, KeyError)
+
+
+def test_hooks_see_submitted_calls(cache_dir):
+    double, events = _recording_cacher(cache_dir)
+
+    assert double.submit(1).result() == 2
+    assert double.submit(1).result() == 2
+    double.submit(1, cache_results=False).result()
+
+    assert [event.outcome for event in events] == ["miss", "hit", "bypass"]
+    miss, hit, _ = events
+    assert {"bind", "select", "compute"} <= set(miss.timings)
+    assert miss.bytes_written > 0 and hit.bytes_read > 0
+
+
+def test_hooks_see_mapped_calls(cache_dir):
+    double, events = _recording_cacher(cache_dir)
+
+    double(1)
+    events.clear()
+    assert double.map([1, 2, 2]) == [2, 4, 4]
+
+    assert sorted(event.outcome for event in events) == ["hit", "hit", "miss"]
+    [miss] = [event for event in events if event.outcome == "miss"]
+    assert "compute" in miss.timings and miss.bytes_written > 0
+    assert miss.location is not None
+    assert {event.location for event in events} == {miss.location}
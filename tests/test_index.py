@@ -0,0 +1,174 @@
+import os
+import sqlite3
+import warnings
+
+import pytest
+
+from cachecache import Cacher
+from cachecache.index import INDEX_FILENAME
+
+
+def _lock_index(cache_dir):
+    "Connection holding the write lock of the index of the cache at 'cache_dir'."
+    connection = sqlite3.connect(os.path.join(cache_dir, INDEX_FILENAME), isolation_level=None)
+    connection.execute("BEGIN EXCLUSIVE")
+    return connection
+
+
+def test_locked_index_falls_back_to_directory_walk(cache_dir):
+    cacher = Cacher(cache_dir, caching_memory_allocation=10**9)
+    memory = cacher.get_cache_memory()
+    memory.size_tracker.index.hits_flush_interval = 0
+
+    @cacher
+    def double(x):
+        return 2 * x
+
+    assert double(1) == 2
+    connection = _lock_index(cache_dir)
+    try:
+        with pytest.warns(UserWarning, match="could not use the index"):
+            assert double(2) == 4  # write
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            assert double(1) == 2  # hit
+            assert double(3) == 6
+    finally:
+        connection.close()
+
+    assert memory.size_tracker.index is None
+    assert memory.size_tracker.nbytes > 0
+    assert double(3) == 6
+    assert cacher.cached_items(double) == []
+
+
+def test_locked_index_on_hit(cache_dir):
+    cacher = Cacher(cache_dir, caching_memory_allocation=10**9)
+    cacher.get_cache_memory().size_tracker.index.hits_flush_interval = 0
+
+    @cacher
+    def double(x):
+        return 2 * x
+
+    assert double(1) == 2
+    connection = _lock_index(cache_dir)
+    try:
+        with pytest.warns(UserWarning, match="could not use the index"):
+            assert double(1) == 2
+    finally:
+        connection.close()
+
+
+def test_unopenable_index_warns(cache_dir):
+    os.makedirs(os.path.join(cache_dir, INDEX_FILENAME))  # not a database
+    with pytest.warns(UserWarning, match="Could not open the index"):
+        cacher = Cacher(cache_dir, caching_memory_allocation=10**9)
+
+    @cacher
+    def double(x):
+        return 2 * x
+
+    assert double(1) == 2
+    assert cacher.get_cache_memory().size_tracker.index is None
+    assert double(1) == 2
+
+
+def test_without_index(cache_dir):
+    cacher = Cacher(cache_dir, caching_memory_allocation=200, use_index=False)
+
+    @cacher
+    def sequence(n):
+        return list(range(n))
+
+    for n in range(10, 20):
+        assert sequence(n) == list(range(n))
+
+    assert not os.path.exists(os.path.join(cache_dir, INDEX_FILENAME))
+    assert cacher.get_cache_memory().size_tracker.nbytes <= 200
+
+
+def test_inflation_shared_across_processes(cache_dir):
+    from joblib import Memory
+
+    from cachecache.index import CacheIndex
+
+    store_backend = Memory(cache_dir, verbose=0).store_backend
+    # indices of the same cache opened by two processes
+    index, other_index = CacheIndex(store_backend), CacheIndex(store_backend)
+    call_id = ("module/func", "0" * 32)
+    os.makedirs(index.item_path(call_id))
+    with open(os.path.join(index.item_path(call_id), "output.pkl"), "wb") as f:
+        f.write(b"x" * 100)
+
+    other_index.inflate(5.0)
+    other_index.inflate(2.0)
+    assert index.inflation == 5.0
+
+    index.record_write(call_id, duration=1.0)
+    [entry] = index.entries()
+    assert entry["priority"] == pytest.approx(5.0 + 1.0 / 100)
+
+    other_index.inflate(7.0)
+    index.record_hit(call_id)
+    index.flush()
+    [entry] = index.entries()
+    assert entry["priority"] == pytest.approx(7.0 + 1.0 / 100)
+
+    index.close()
+    other_index.close()
+
+
+def test_total_size_kept_across_writes_and_removals(cache_dir):
+    from joblib import Memory
+
+    from cachecache.index import CacheIndex
+
+    store_backend = Memory(cache_dir, verbose=0).store_backend
+    index, other_index = CacheIndex(store_backend), CacheIndex(store_backend)
+
+    def write(call_id, size):
+        os.makedirs(index.item_path(call_id), exist_ok=True)
+        with open(os.path.join(index.item_path(call_id), "output.pkl"), "wb") as f:
+            f.write(b"x" * size)
+        index.record_write(call_id)
+
+    def summed_size():
+        return index._connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    write(("module/f", "0" * 32), 100)
+    write(("module/f", "1" * 32), 200)
+    write(("module/g", "0" * 32), 300)
+    assert index.total_size() == other_index.total_size() == summed_size() == 600
+
+    write(("module/f", "1" * 32), 50)  # overwrite
+    assert index.total_size() == other_index.total_size() == summed_size() == 450
+
+    other_index.remove([("module/f", "0" * 32), ("module/f", "2" * 32)])
+    assert index.total_size() == summed_size() == 350
+
+    index.remove_function("module/g")
+    assert index.total_size() == summed_size() == 50
+
+    # indices opened before the running total was kept compute it
+    index._connection.execute("DELETE FROM meta WHERE key = 'total_size'")
+    index.close()
+    other_index.close()
+    index = CacheIndex(store_backend)
+    assert index.total_size() == 50
+    index.close()
+
+
+def test_memory_tier_hits_recorded_in_index(cache_dir):
+    cacher = Cacher(cache_dir, memory_tier_bytes=10**6)
+
+    @cacher
+    def double(x):
+        return 2 * x
+
+    double(1)
+    for _ in range(3):
+        assert double(1) == 2  # served from RAM
+    [entry] = cacher.cached_items(double)
+
+    assert entry["hits"] == 3
+    assert entry["last_access"] > entry["created"]
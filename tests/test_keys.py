@@ -0,0 +1,66 @@
+from pathlib import Path
+
+from cachecache import Cacher
+from cachecache.cachecache import get_signature_binder
+from cachecache.keys import FastKey
+
+
+def _fast_key(func, ignore=()):
+    return FastKey(get_signature_binder(func), ignore)
+
+
+def test_distinct_keys_for_equal_values_of_distinct_types():
+    def identity(x):
+        return x
+
+    fast_key = _fast_key(identity)
+    args_ids = [fast_key.args_id((x,), {}) for x in (1, 1.0, True, "1", Path("1"), b"1", (1,), [1])]
+    assert None not in args_ids
+    assert len(set(args_ids)) == len(args_ids)
+
+
+def test_keys_independent_of_dict_order_and_argument_passing():
+    def combine(options, scale=1):
+        return options
+
+    fast_key = _fast_key(combine)
+    args_id = fast_key.args_id(({"a": 1, "b": [2, "c"]},), {})
+    assert len(args_id) == 32
+    assert fast_key.args_id(({"b": [2, "c"], "a": 1},), {}) == args_id
+    assert fast_key.args_id((), {"options": {"b": [2, "c"], "a": 1}, "scale": 1}) == args_id
+    assert fast_key.args_id(({"a": 1, "b": [2, "c"]}, 2), {}) != args_id
+    # strings are length-prefixed, so that their concatenations are not confused
+    assert fast_key.args_id((["ab", "c"],), {}) != fast_key.args_id((["a", "bc"],), {})
+
+
+def test_unsupported_arguments_left_to_joblib():
+    import enum
+
+    class Color(enum.Enum):
+        RED = 1
+
+    def identity(x):
+        return x
+
+    def keywords(**kwargs):
+        return kwargs
+
+    fast_key = _fast_key(identity)
+    assert fast_key.args_id((Color.RED,), {}) is None
+    assert fast_key.args_id((object(),), {}) is None
+    assert _fast_key(keywords).args_id((), {"x": 1}) is None
+
+
+def test_ignored_arguments(cache_dir):
+    calls = []
+    cacher = Cacher(cache_dir, fast_keys=True)
+
+    @cacher
+    def double(x, again=False):
+        calls.append(x)
+        return 2 * x
+
+    assert double(1) == double(1, again=False) == double(x=1) == 2
+    assert calls == [1]
+    assert double(1.0) == 2.0 and double("1") == "11"
+    assert calls == [1, 1.0, "1"]
@@ -0,0 +1,90 @@
+import multiprocessing
+import os
+import time
+
+import pytest
+
+from cachecache import Cacher
+from cachecache.locks import LeaseLock
+
+
+def test_lease_lock_is_exclusive(cache_dir):
+    path = os.path.join(cache_dir, "call.lock")
+    lock, other_lock = LeaseLock(path), LeaseLock(path)
+
+    assert lock.acquire()
+    assert lock.owned
+    assert not other_lock.acquire()
+    assert not other_lock.owned
+
+    lock.release()
+    assert not os.path.exists(path)
+    assert other_lock.acquire()
+    other_lock.release()
+
+
+def test_release_keeps_lock_taken_over(cache_dir):
+    path = os.path.join(cache_dir, "call.lock")
+    lock = LeaseLock(path)
+    assert lock.acquire()
+
+    # the lease was taken over by another process
+    with open(path, "w") as f:
+        f.write("other token")
+    lock.release()
+
+    assert os.path.exists(path)
+
+
+def test_stale_lease_is_taken_over(cache_dir):
+    path = os.path.join(cache_dir, "call.lock")
+    # lock file of a crashed process, not refreshed for a long time
+    with open(path, "w") as f:
+        f.write("crashed token")
+    os.utime(path, (0, 0))
+
+    lock = LeaseLock(path, lease_duration=1)
+    assert lock.is_stale()
+    assert lock.acquire()
+    assert lock.owned
+    lock.release()
+    assert not os.path.exists(path)
+
+
+def test_held_lease_is_refreshed(cache_dir):
+    path = os.path.join(cache_dir, "call.lock")
+    lock = LeaseLock(path, lease_duration=0.3)
+    assert lock.acquire()
+
+    time.sleep(0.6)
+    assert not lock.is_stale()
+    assert not LeaseLock(path, lease_duration=0.3).acquire()
+    lock.release()
+
+
+def _call_slow_double(cache_dir, log_path):
+    "Call a slow cached function locked across processes, logging each computation."
+    cacher = Cacher(cache_dir, lock_across_processes=True, lock_poll_interval=0.05)
+
+    @cacher
+    def slow_double(x):
+        with open(log_path, "a") as f:
+            f.write(f"{os.getpid()}\n")
+        time.sleep(0.5)
+        return 2 * x
+
+    return slow_double(21)
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(), reason="requires the fork start method"
+)
+def test_missing_results_computed_by_a_single_process(cache_dir):
+    log_path = os.path.join(cache_dir, "computations.log")
+    context = multiprocessing.get_context("fork")
+    with context.Pool(6) as pool:
+        results = pool.starmap(_call_slow_double, [(cache_dir, log_path)] * 6)
+
+    assert results == [42] * 6
+    with open(log_path) as f:
+        assert len(f.read().splitlines()) == 1
@@ -0,0 +1,48 @@
+from cachecache import Cacher
+
+
+def _counting_func(cache_dir):
+    calls = []
+
+    @Cacher(cache_dir)
+    def power(x, exponent=2):
+        calls.append((x, exponent))
+        return x**exponent
+
+    return power, calls
+
+
+def test_map_order(cache_dir):
+    power, _ = _counting_func(cache_dir)
+
+    arguments = [3, (2, 3), {"x": 2, "exponent": 4}, [5], 1]
+    assert power.map(arguments, n_jobs=2) == [9, 8, 16, 25, 1]
+    assert power.map(arguments) == [9, 8, 16, 25, 1]
+
+
+def test_map_computes_only_misses(cache_dir):
+    power, calls = _counting_func(cache_dir)
+
+    power(2)
+    power(3)
+    calls.clear()
+    assert power.map([1, 2, 3, 4]) == [1, 4, 9, 16]
+    assert sorted(calls) == [(1, 2), (4, 2)]
+    stats = power.cache_stats()
+    assert (stats["hits"], stats["misses"]) == (2, 4)
+
+    # computed results are cached
+    calls.clear()
+    assert power.map([1, 4]) == [1, 16]
+    assert calls == []
+
+    # again recomputes all calls
+    assert power.map([1, 4], again=True) == [1, 16]
+    assert sorted(calls) == [(1, 2), (4, 2)]
+
+
+def test_map_computes_identical_calls_once(cache_dir):
+    power, calls = _counting_func(cache_dir)
+
+    assert power.map([2, (2,), {"x": 2}, 2, (2, 3)]) == [4, 4, 4, 4, 8]
+    assert sorted(calls) == [(2, 2), (2, 3)]
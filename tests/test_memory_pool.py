@@ -0,0 +1,51 @@
+import os
+from pathlib import Path
+
+from cachecache import Cacher
+from cachecache.cachecache import MemoryPool
+
+
+def test_pool_reuses_and_evicts_least_recently_used(cache_dir):
+    opened, evicted = [], []
+
+    def open_memory(path):
+        opened.append(path)
+        return object()
+
+    pool = MemoryPool(open_memory, maxsize=2, on_evict=evicted.append)
+    a, b, c = Path(cache_dir, "a"), Path(cache_dir, "b"), Path(cache_dir, "c")
+
+    memory_a = pool.get(a)
+    assert pool.get(str(a)) is memory_a  # same resolved path
+    assert pool.get(Path(cache_dir, "b", "..", "a")) is memory_a
+    memory_b = pool.get(b)
+    assert opened == [a.resolve(), b.resolve()]
+
+    pool.get(a)  # a is now the most recently used
+    pool.get(c)
+    assert evicted == [memory_b]
+    assert len(pool) == 2
+    assert pool.get(a) is memory_a
+    pool.get(b)
+    assert len(opened) == 4
+
+    pool.clear()
+    assert len(pool) == 0 and len(evicted) == 4
+
+
+def test_unwritable_path_not_pooled():
+    pool = MemoryPool(lambda path: None)
+    assert pool.get("/unwritable") is None
+    assert len(pool) == 0
+
+
+def test_cacher_pool(cache_dir):
+    cacher = Cacher(os.path.join(cache_dir, "global"), memory_pool_size=2)
+    paths = [os.path.join(cache_dir, name) for name in "abc"]
+
+    memory_a = cacher.get_cache_memory(paths[0])
+    assert cacher.get_cache_memory(paths[0]) is memory_a
+    cacher.get_cache_memory(paths[1])
+    cacher.get_cache_memory(paths[2])
+    assert len(cacher.memory_pool) == 2
+    assert cacher.get_cache_memory(paths[0]) is not memory_a
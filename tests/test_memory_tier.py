@@ -0,0 +1,61 @@
+import glob
+import os
+
+from cachecache import Cacher
+from cachecache.cachecache import MemoryTier
+from cachecache.utils import estimate_size
+
+
+def test_byte_limit():
+    value = b"x" * 1000
+    nbytes = estimate_size(value)
+    tier = MemoryTier(2.5 * nbytes)
+
+    tier.put("a", value)
+    tier.put("b", value)
+    assert tier.get("a") is value  # a is now the most recently used
+    tier.put("c", value)
+    assert "b" not in tier and "a" in tier and "c" in tier
+    assert tier.nbytes == 2 * nbytes <= tier.max_bytes
+
+    tier.put("big", b"x" * 10**4)  # larger than the tier, not stored
+    assert "big" not in tier and len(tier) == 2
+
+    tier.pop("a")
+    assert tier.nbytes == nbytes
+    tier.clear()
+    assert tier.nbytes == 0 and len(tier) == 0
+
+
+def test_memory_tier_hits(cache_dir):
+    calls = []
+    cacher = Cacher(cache_dir, memory_tier_bytes=10**6)
+
+    @cacher
+    def square(x, memory_tier=None):
+        calls.append(x)
+        return x * x
+
+    assert square(3) == 9
+    # served by the memory tier, even without the disk cache
+    for output_path in glob.glob(os.path.join(cache_dir, "**", "output.pkl"), recursive=True):
+        os.remove(output_path)
+    assert square(3) == 9
+    assert calls == [3]
+    assert square.cache_stats()["hits"] == 1
+
+    # bypassing the memory tier
+    assert square(3, memory_tier=False) == 9
+    assert calls == [3, 3]
+
+
+def test_memory_tier_bypassed_by_large_results(cache_dir):
+    cacher = Cacher(cache_dir, memory_tier_bytes=100)
+
+    @cacher
+    def zeros(n):
+        return b"\0" * n
+
+    zeros(10**4)
+    assert len(cacher.memory_tier) == 0
+    assert zeros(10**4) == b"\0" * 10**4
@@ -0,0 +1,30 @@
+import pytest
+
+from cachecache import Cacher
+
+np = pytest.importorskip("numpy")
+
+
+def test_results_larger_than_the_cache_are_returned(cache_dir):
+    cacher = Cacher(cache_dir, caching_memory_allocation=100, mmap_mode="r")
+
+    @cacher
+    def arange(n):
+        return np.arange(n)
+
+    # evicted as soon as written
+    np.testing.assert_array_equal(arange(10**5), np.arange(10**5))
+    [results] = arange.map([2 * 10**5])
+    np.testing.assert_array_equal(results, np.arange(2 * 10**5))
+
+
+def test_results_memory_mapped(cache_dir):
+    cacher = Cacher(cache_dir, mmap_mode="r")
+
+    @cacher
+    def arange(n, mmap_mode=None):
+        return np.arange(n)
+
+    assert isinstance(arange(10**5), np.memmap)
+    assert isinstance(arange(10**5), np.memmap)
+    assert not isinstance(arange(10**5, mmap_mode=False), np.memmap)
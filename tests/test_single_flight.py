@@ -0,0 +1,146 @@
+import threading
+import time
+
+from cachecache import Cacher
+
+
+def _counting_cacher(cache_dir, monkeypatch, load_delay=0.5):
+    "Cacher whose disk cache loads take 'load_delay' seconds, and a cached function counting its calls."
+    original_load = Cacher._load
+
+    def slow_load(self, *args, **kwargs):
+        time.sleep(load_delay)
+        return original_load(self, *args, **kwargs)
+
+    monkeypatch.setattr(Cacher, "_load", slow_load)
+    cacher = Cacher(cache_dir)
+    n_calls = [0]
+
+    def count(x, again=False, max_age=None):
+        n_calls[0] += 1
+        return n_calls[0]
+
+    return cacher(count), n_calls
+
+
+def _call_in_thread(func, *args, **kwargs):
+    "Start a thread calling func(*args, **kwargs), return it and the list its results are appended to."
+    results = []
+    thread = threading.Thread(target=lambda: results.append(func(*args, **kwargs)))
+    thread.start()
+    return thread, results
+
+
+def test_concurrent_identical_calls_computed_once(cache_dir, monkeypatch):
+    count, n_calls = _counting_cacher(cache_dir, monkeypatch, load_delay=0.2)
+
+    threads = [_call_in_thread(count, 1) for _ in range(8)]
+    for thread, _ in threads:
+        thread.join()
+
+    assert n_calls[0] == 1
+    assert [results for _, results in threads] == [[1]] * 8
+
+
+def test_refresh_does_not_join_concurrent_load(cache_dir, monkeypatch):
+    count, n_calls = _counting_cacher(cache_dir, monkeypatch)
+    assert count(1, again=True) == 1
+
+    # a plain call is loading the cached results while a refresh is requested
+    load_thread, load_results = _call_in_thread(count, 1)
+    time.sleep(0.1)
+    refresh_thread, refresh_results = _call_in_thread(count, 1, again=True)
+    load_thread.join()
+    refresh_thread.join()
+
+    # (the plain call may load the refreshed results)
+    assert load_results in ([1], [2])
+    assert refresh_results == [2]
+    assert n_calls[0] == 2
+
+
+def test_max_age_does_not_join_concurrent_load(cache_dir, monkeypatch):
+    count, n_calls = _counting_cacher(cache_dir, monkeypatch)
+    assert count(1, again=True) == 1
+    time.sleep(0.3)
+
+    # a plain call is loading the cached results while fresher results are required
+    load_thread, load_results = _call_in_thread(count, 1)
+    time.sleep(0.1)
+    fresh_thread, fresh_results = _call_in_thread(count, 1, max_age=0.2)
+    load_thread.join()
+    fresh_thread.join()
+
+    assert load_results in ([1], [2])
+    assert fresh_results == [2]
+
+
+def test_refresh_does_not_join_across_cachers(cache_dir, monkeypatch):
+    count, n_calls = _counting_cacher(cache_dir, monkeypatch)
+    assert count(1, again=True) == 1
+    other_count = Cacher(cache_dir)(count.__wrapped__)
+
+    load_thread, load_results = _call_in_thread(count, 1)
+    time.sleep(0.1)
+    refresh_thread, refresh_results = _call_in_thread(other_count, 1, again=True)
+    load_thread.join()
+    refresh_thread.join()
+
+    # (the plain call may load the refreshed results)
+    assert load_results in ([1], [2])
+    assert refresh_results == [2]
+
+
+def test_async_refresh_does_not_join_concurrent_await(cache_dir, monkeypatch):
+    import asyncio
+
+    original_load = Cacher._load
+
+    def slow_load(self, *args, **kwargs):
+        time.sleep(0.5)
+        return original_load(self, *args, **kwargs)
+
+    monkeypatch.setattr(Cacher, "_load", slow_load)
+    n_calls = [0]
+
+    async def count(x, again=False, max_age=None):
+        n_calls[0] += 1
+        return n_calls[0]
+
+    count = Cacher(cache_dir)(count)
+
+    async def main():
+        assert await count(1, again=True) == 1
+        plain = asyncio.ensure_future(count(1))
+        await asyncio.sleep(0.1)
+        refreshed = await count(1, again=True)
+        return await plain, refreshed
+
+    plain_results, refreshed_results = asyncio.run(main())
+    assert plain_results in (1, 2)
+    assert refreshed_results == 2
+    assert n_calls[0] == 2
+
+
+def test_concurrent_hits_get_their_own_copy(cache_dir, monkeypatch):
+    cacher = Cacher(cache_dir)
+
+    @cacher
+    def sequence(n):
+        return list(range(n))
+
+    sequence(10)
+    original_load = Cacher._load
+
+    def slow_load(self, *args, **kwargs):
+        time.sleep(0.2)
+        return original_load(self, *args, **kwargs)
+
+    monkeypatch.setattr(Cacher, "_load", slow_load)
+    threads = [_call_in_thread(sequence, 10) for _ in range(4)]
+    for thread, _ in threads:
+        thread.join()
+
+    results = [result for _, (result,) in threads]
+    assert all(result == list(range(10)) for result in results)
+    assert len({id(result) for result in results}) == 4
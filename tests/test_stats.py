@@ -0,0 +1,32 @@
+import os
+
+from cachecache import Cacher
+
+
+def test_bytes_read_and_written(cache_dir):
+    cacher = Cacher(cache_dir)
+
+    @cacher
+    def sequence(n):
+        return list(range(n))
+
+    sequence(1000)
+    sequence(1000)
+    [item] = cacher.cached_items(sequence)
+    item_path = os.path.join(cache_dir, item["func_id"], item["args_id"])
+
+    stats = sequence.cache_stats()
+    assert (stats["misses"], stats["hits"]) == (1, 1)
+    assert stats["bytes_written"] == item["size"] > 0
+    assert stats["bytes_read"] == os.path.getsize(os.path.join(item_path, "output.pkl"))
+
+
+def test_bytes_written_without_index(cache_dir):
+    cacher = Cacher(cache_dir, use_index=False)
+
+    @cacher
+    def sequence(n):
+        return list(range(n))
+
+    sequence(1000)
+    assert sequence.cache_stats()["bytes_written"] == cacher.get_cache_memory().size_tracker.nbytes > 0
@@ -0,0 +1,71 @@
+import time
+
+from cachecache import Cacher
+
+
+def _counting_func(cacher, **options):
+    calls = []
+
+    @cacher(**options)
+    def count(x, max_age=None):
+        calls.append(x)
+        return x
+
+    return count, calls
+
+
+def test_ttl(cache_dir):
+    count, calls = _counting_func(Cacher(cache_dir, memory_tier_bytes=10**6), ttl=0.2)
+
+    count(1)
+    count(1)
+    assert calls == [1]
+    time.sleep(0.3)
+    count(1)  # expired, in the memory tier and on the disk
+    assert calls == [1, 1]
+
+
+def test_cacher_ttl(cache_dir):
+    count, calls = _counting_func(Cacher(cache_dir, ttl=0.2))
+
+    count(1)
+    time.sleep(0.3)
+    count(1)
+    assert calls == [1, 1]
+
+
+def test_max_age(cache_dir):
+    count, calls = _counting_func(Cacher(cache_dir))
+
+    count(1)
+    time.sleep(0.2)
+    count(1, max_age=10)
+    assert calls == [1]
+    count(1, max_age=0.1)
+    assert calls == [1, 1]
+    count(1, max_age=0.1)  # just refreshed
+    assert calls == [1, 1]
+
+
+def test_clear_expired(cache_dir):
+    cacher = Cacher(cache_dir)
+
+    @cacher(ttl=0.1)
+    def short_lived(x):
+        return x
+
+    @cacher
+    def long_lived(x):
+        return x
+
+    short_lived(1)
+    long_lived(1)
+    long_lived(2)
+    time.sleep(0.2)
+
+    assert cacher.clear_expired() == 1
+    assert cacher.cached_items(short_lived) == []
+    assert len(cacher.cached_items(long_lived)) == 2
+
+    assert cacher.clear_expired(max_age=0.1) == 2
+    assert cacher.cached_items(long_lived) == []
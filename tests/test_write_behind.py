@@ -0,0 +1,113 @@
+import multiprocessing
+import threading
+import time
+
+import pytest
+
+from cachecache import Cacher
+from cachecache.write_behind import WriteBehind
+
+
+def test_discard_skips_queued_writes():
+    write_behind = WriteBehind(max_workers=1)
+    started, release = threading.Event(), threading.Event()
+    written = []
+
+    def blocking_write():
+        started.set()
+        release.wait()
+        written.append("a")
+
+    write_behind.submit("a", 1, blocking_write)
+    write_behind.submit("b", 2, lambda: written.append("b"))
+    started.wait()
+    assert write_behind.get("b") == 2
+
+    discarded = threading.Thread(target=write_behind.discard, args=(lambda key: key in ("a", "b"),))
+    discarded.start()
+    time.sleep(0.1)
+    # waits for the running write of "a"
+    assert discarded.is_alive()
+    assert write_behind.get("a") is None and write_behind.get("b") is None
+
+    release.set()
+    discarded.join()
+    write_behind.flush()
+    assert written == ["a"]
+    assert len(write_behind) == 0
+
+
+def test_invalidate_drops_pending_results(cache_dir):
+    cacher = Cacher(cache_dir, write_behind=True)
+    n_calls = [0]
+
+    @cacher
+    def count(x):
+        n_calls[0] += 1
+        return n_calls[0]
+
+    # the worker is kept busy, so that the results of count(1) stay pending
+    release = threading.Event()
+    cacher.write_behind.submit(("elsewhere", "func", "args"), None, release.wait)
+    try:
+        assert count(1) == 1
+        assert count(1) == 1  # served from memory
+
+        invalidation = threading.Thread(target=cacher.invalidate, args=(count,))
+        invalidation.start()
+        invalidation.join(timeout=5)
+        assert not invalidation.is_alive()
+        assert count(1) == 2
+    finally:
+        release.set()
+
+    cacher.flush()
+    assert count(1) == 2
+    assert n_calls[0] == 2
+
+
+def test_clear_expired_clears_pending_results(cache_dir):
+    cacher = Cacher(cache_dir, write_behind=True)
+    n_calls = [0]
+
+    @cacher
+    def count(x):
+        n_calls[0] += 1
+        return n_calls[0]
+
+    assert count(1) == 1
+    time.sleep(0.2)
+    assert cacher.clear_expired(max_age=0.1) == 1
+    assert count(1) == 2
+
+
+def _call_and_flush(cacher, func, n_calls, results):
+    "Call func on n_calls new arguments, then write the pending results (in a forked child process)."
+    results.put([func(x) for x in range(1, n_calls + 1)])
+    cacher.flush()
+    results.put(len(cacher.cached_items(func)))
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(), reason="requires the fork start method"
+)
+def test_write_behind_in_forked_child(cache_dir):
+    cacher = Cacher(cache_dir, write_behind=True, write_behind_max_pending=2)
+
+    @cacher
+    def double(x):
+        return 2 * x
+
+    assert double(0) == 0
+    cacher.flush()
+
+    context = multiprocessing.get_context("fork")
+    results = context.Queue()
+    child = context.Process(target=_call_and_flush, args=(cacher, double, 11, results))
+    child.start()
+    child.join(timeout=30)
+    if child.is_alive():
+        child.kill()
+    assert child.exitcode == 0
+    assert results.get(timeout=1) == [2 * x for x in range(1, 12)]
+    assert results.get(timeout=1) == 12